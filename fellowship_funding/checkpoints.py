@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+import shutil
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .config import Config
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path("data/checkpoints")
+FORMAT_VERSION = 2
+KEEP_DAYS = 7
+# Sorts chronologically as a string
+RUN_ID_FORMAT = "%Y%m%dT%H%M%SZ"
+
+FETCHED = "fetched"
+SCORED = "scored"
+NEW = "new"
+SENT = "sent"
+
+
+class Checkpoint:
+    # One directory per run and profile set, named by the run ID (its UTC
+    # start time) and the profile fingerprint. Stages: fetched (shared), then
+    # scored, new and sent per profile. --resume picks up the latest
+    # incomplete run for the same profiles, whenever it started, and starts
+    # after the last stage found there.
+    def __init__(
+        self,
+        configs: list[Config],
+        resume: bool = False,
+        now: datetime | None = None,
+        root: Path = DEFAULT_DIR,
+    ):
+        now = now or datetime.now(timezone.utc)
+        self.resume = resume
+        self.root = root
+        key = fingerprint(configs)
+        latest = _latest_run(root, key, now) if resume else None
+        self.run_id = latest or now.strftime(RUN_ID_FORMAT)
+        self.dir = root / f"{self.run_id}-{key}"
+        if latest:
+            logger.info("Resuming run %s from %s", latest, self.dir)
+
+    def save(self, stage: str, payload: Any, profile: str | None = None) -> None:
+        path = self._path(stage, profile)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(
+                {"version": FORMAT_VERSION, "run": self.run_id, "stage": stage, "data": payload},
+                f, separators=(",", ":"),
+            )
+        tmp.replace(path)
+
+    def load(self, stage: str, profile: str | None = None) -> Any | None:
+        # Only a --resume run reads checkpoints back
+        path = self._path(stage, profile)
+        if not self.resume or not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            logger.warning("Could not read checkpoint %s, ignoring it", path)
+            return None
+        if data.get("version") != FORMAT_VERSION or data.get("run") != self.run_id:
+            logger.warning("Checkpoint %s is from another run or format, ignoring it", path)
+            return None
+        logger.info("Resuming from checkpoint %s", path)
+        return data["data"]
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def prune(self, keep_days: int = KEEP_DAYS) -> None:
+        if not self.root.exists():
+            return
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).strftime(RUN_ID_FORMAT)
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name[:len(cutoff)] < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _path(self, stage: str, profile: str | None) -> Path:
+        if profile is None:
+            return self.dir / f"{stage}.json.gz"
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "-", profile or "default").strip("-")
+        return self.dir / f"{stage}-{slug}.json.gz"
+
+
+def _latest_run(root: Path, key: str, now: datetime) -> str | None:
+    # A successful run clears its directory, so any left over is incomplete;
+    # those older than KEEP_DAYS are left for prune()
+    cutoff = (now - timedelta(days=KEEP_DAYS)).strftime(RUN_ID_FORMAT)
+    suffix = f"-{key}"
+    runs = [
+        path.name.removesuffix(suffix)
+        for path in (root.glob(f"*{suffix}") if root.exists() else [])
+        if path.is_dir()
+    ]
+    runs = [run for run in runs if len(run) == len(cutoff) and run >= cutoff]
+    return max(runs, default=None)
+
+
+def fingerprint(configs: list[Config]) -> str:
+    # Credentials rotate independently of what a run fetches and scores
+    profiles = [
+        {k: v for k, v in asdict(config).items() if not k.startswith("gmail_")}
+        for config in configs
+    ]
+    return hashlib.sha256(json.dumps(profiles, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def encode_scored(scored: list[tuple[Opportunity, int]]) -> list:
+    return [[opp.to_dict(), score] for opp, score in scored]
+
+
+def decode_scored(data: list) -> list[tuple[Opportunity, int]]:
+    return [(Opportunity.from_dict(opp), score) for opp, score in data]
@@ -4,6 +4,8 @@ import json
 import os
 from dataclasses import dataclass, field
 
+from .sources import select
+
 DEFAULT_KEYWORDS = [
     "public health", "health disparities", "food insecurity",
     "community health", "nutrition", "epidemiology",
@@ -11,6 +13,7 @@ DEFAULT_KEYWORDS = [
 DEFAULT_DISCIPLINES = [
     "public health", "epidemiology", "social sciences", "life sciences",
 ]
+DEFAULT_REMINDER_DAYS = [30, 7]
 
 
 @dataclass
@@ -25,28 +28,102 @@ class Config:
     sender_email: str = ""
     recipient_email: str = ""
     score_threshold: int = 10
+    # Days past a listed deadline before the pre-filter drops a record
+    deadline_grace_days: int = 0
+    # Digest budget: max items overall (0 = unlimited), max items per source
+    # (registry name -> cap), and minimum days left before a listed deadline
+    max_digest: int = 0
+    source_caps: dict[str, int] = field(default_factory=dict)
+    min_deadline_days: int = 0
+    # Days before a reported opportunity's deadline to send it again as a reminder
+    reminder_days: list[int] = field(default_factory=lambda: list(DEFAULT_REMINDER_DAYS))
+    # Registry names of sources to run (None runs all) and sources to skip
+    sources: list[str] | None = None
+    disabled_sources: list[str] = field(default_factory=list)
+    # Namespace for per-profile state (seen store); empty for the default profile
+    name: str = ""
 
 
 def load_config() -> Config:
     profile_json = os.environ.get("PROFILE_JSON", "")
     profile = json.loads(profile_json) if profile_json else {}
+    return build_config(profile)
+
+
+def load_profiles() -> list[Config]:
+    profiles_json = os.environ.get("PROFILES_JSON", "")
+    if not profiles_json:
+        return [load_config()]
+
+    profiles = json.loads(profiles_json)
+    if not isinstance(profiles, list) or not profiles:
+        raise ValueError("PROFILES_JSON must be a non-empty JSON list of profiles")
+
+    configs = []
+    for i, profile in enumerate(profiles):
+        config = build_config(profile)
+        config.name = str(profile.get("name") or f"profile{i + 1}")
+        configs.append(config)
+
+    names = [c.name for c in configs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate profile names in PROFILES_JSON: {names}")
+    return configs
 
+
+def build_config(profile: dict) -> Config:
+    # Profiles also arrive over the local API, so check types before anything
+    # iterates a string as a list or calls str methods on a number
     kwargs: dict = {}
-    if "keywords" in profile:
-        kwargs["keywords"] = profile["keywords"]
-    if "disciplines" in profile:
-        kwargs["disciplines"] = profile["disciplines"]
-    if "academic_level" in profile:
-        kwargs["academic_level"] = profile["academic_level"]
-    if "citizenship" in profile:
-        kwargs["citizenship"] = profile["citizenship"]
-    if "score_threshold" in profile:
-        kwargs["score_threshold"] = int(profile["score_threshold"])
+    for key in ("keywords", "disciplines", "disabled_sources"):
+        if key in profile:
+            kwargs[key] = _strings(profile, key)
+    if "sources" in profile:
+        kwargs["sources"] = None if profile["sources"] is None else _strings(profile, "sources")
+    for key in ("academic_level", "citizenship"):
+        if key in profile:
+            if not isinstance(profile[key], str):
+                raise ValueError(f"{key} must be a string")
+            kwargs[key] = profile[key]
+    for key in ("score_threshold", "deadline_grace_days", "max_digest", "min_deadline_days"):
+        if key in profile:
+            kwargs[key] = _integer(profile[key], key)
+    if "source_caps" in profile:
+        caps = profile["source_caps"]
+        if not isinstance(caps, dict):
+            raise ValueError("source_caps must be an object of source name -> cap")
+        kwargs["source_caps"] = {k: _integer(v, f"source_caps.{k}") for k, v in caps.items()}
+    if "reminder_days" in profile:
+        days = profile["reminder_days"]
+        if not isinstance(days, list):
+            raise ValueError("reminder_days must be a list of integers")
+        kwargs["reminder_days"] = [_integer(d, "reminder_days") for d in days]
+    if not isinstance(profile.get("recipient_email") or "", str):
+        raise ValueError("recipient_email must be a string")
+    # Fail on unknown source names up front rather than mid-run
+    select(kwargs.get("sources"), kwargs.get("disabled_sources"))
+    select(list(kwargs.get("source_caps", {})))
 
     kwargs["gmail_client_id"] = os.environ.get("GMAIL_CLIENT_ID", "")
     kwargs["gmail_client_secret"] = os.environ.get("GMAIL_CLIENT_SECRET", "")
     kwargs["gmail_refresh_token"] = os.environ.get("GMAIL_REFRESH_TOKEN", "")
     kwargs["sender_email"] = os.environ.get("SENDER_EMAIL", "")
-    kwargs["recipient_email"] = os.environ.get("RECIPIENT_EMAIL", "")
+    kwargs["recipient_email"] = profile.get("recipient_email") or os.environ.get("RECIPIENT_EMAIL", "")
 
     return Config(**kwargs)
+
+
+def _strings(profile: dict, key: str) -> list[str]:
+    value = profile[key]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{key} must be a list of strings")
+    return value
+
+
+def _integer(value: object, key: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{key} must be an integer")
+    try:
+        return int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"{key} must be an integer, got {value!r}") from None
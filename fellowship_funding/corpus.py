@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("data/corpus.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS opportunities (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    url TEXT,
+    source TEXT,
+    description TEXT,
+    deadline TEXT,
+    amount TEXT,
+    eligibility TEXT,
+    organization TEXT,
+    notes TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS opportunities_deadline ON opportunities (deadline);
+CREATE INDEX IF NOT EXISTS opportunities_source ON opportunities (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5 (
+    title, description, eligibility, organization
+);
+"""
+
+UPSERT = """
+INSERT INTO opportunities (
+    id, title, url, source, description, deadline, amount,
+    eligibility, organization, notes, first_seen, last_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title,
+    url = excluded.url,
+    source = excluded.source,
+    description = excluded.description,
+    deadline = excluded.deadline,
+    amount = excluded.amount,
+    eligibility = excluded.eligibility,
+    organization = excluded.organization,
+    notes = excluded.notes,
+    last_seen = excluded.last_seen
+RETURNING rowid
+"""
+
+SEARCH = """
+SELECT o.id, o.title, o.url, o.source, o.description, o.deadline, o.amount,
+       o.eligibility, o.organization, o.notes, bm25(opportunities_fts) AS rank
+FROM opportunities_fts
+JOIN opportunities o ON o.rowid = opportunities_fts.rowid
+WHERE opportunities_fts MATCH ?
+  AND (o.deadline IS NULL OR o.deadline >= ?)
+  {source_filter}
+ORDER BY rank
+LIMIT ?
+"""
+
+
+def connect(path: Path = DEFAULT_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def upsert(opportunities: list[Opportunity], path: Path = DEFAULT_PATH) -> int:
+    today = date.today().isoformat()
+    conn = connect(path)
+    try:
+        with conn:
+            for opp in opportunities:
+                (rowid,) = conn.execute(UPSERT, (
+                    opp.id, opp.title, opp.url, opp.source, opp.description,
+                    opp.deadline.isoformat() if opp.deadline else None,
+                    opp.amount, opp.eligibility, opp.organization, opp.notes,
+                    today, today,
+                )).fetchone()
+                conn.execute("DELETE FROM opportunities_fts WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO opportunities_fts (rowid, title, description, eligibility, organization) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (rowid, opp.title, opp.description, opp.eligibility, opp.organization),
+                )
+    finally:
+        conn.close()
+    logger.info("Corpus: upserted %d opportunities into %s", len(opportunities), path)
+    return len(opportunities)
+
+
+def search(
+    query: str,
+    path: Path = DEFAULT_PATH,
+    deadline_after: date | None = None,
+    source: str = "",
+    limit: int = 20,
+) -> list[tuple[Opportunity, float]]:
+    match = _match_expression(query)
+    if not match or not path.exists():
+        return []
+
+    params: list = [match, (deadline_after or date.today()).isoformat()]
+    source_filter = ""
+    if source:
+        source_filter = "AND o.source = ?"
+        params.append(source)
+    params.append(limit)
+
+    conn = connect(path)
+    try:
+        rows = conn.execute(SEARCH.format(source_filter=source_filter), params).fetchall()
+    finally:
+        conn.close()
+
+    return [(_row_to_opportunity(row[:10]), row[10]) for row in rows]
+
+
+def load_all(path: Path = DEFAULT_PATH) -> list[Opportunity]:
+    if not path.exists():
+        return []
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT id, title, url, source, description, deadline, amount, "
+            "eligibility, organization, notes FROM opportunities"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_opportunity(row) for row in rows]
+
+
+def _match_expression(query: str) -> str:
+    # Quote each term so user input can't trip FTS5 query syntax; terms are ANDed
+    terms = [t.replace('"', '""') for t in query.split()]
+    return " ".join(f'"{t}"' for t in terms)
+
+
+def _row_to_opportunity(row: tuple) -> Opportunity:
+    (opp_id, title, url, source, description, deadline,
+     amount, eligibility, organization, notes) = row
+    return Opportunity(
+        id=opp_id,
+        title=title or "",
+        url=url or "",
+        source=source or "",
+        description=description or "",
+        deadline=date.fromisoformat(deadline) if deadline else None,
+        amount=amount or "",
+        eligibility=eligibility or "",
+        organization=organization or "",
+        notes=notes or "",
+    )
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+from collections.abc import Iterable, Iterator
 from datetime import date, timedelta
 from pathlib import Path
 
@@ -13,6 +15,17 @@ DEFAULT_PATH = Path("data/seen.json")
 MAX_AGE_DAYS = 180
 
 
+def seen_path(profile: str = "") -> Path:
+    return profile_path(DEFAULT_PATH, profile)
+
+
+def profile_path(base: Path, profile: str = "") -> Path:
+    if not profile:
+        return base
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", profile).strip("-")
+    return base.with_name(f"{base.stem}-{slug}{base.suffix}")
+
+
 def load_seen(path: Path = DEFAULT_PATH) -> dict[str, str]:
     if not path.exists():
         return {}
@@ -33,10 +46,10 @@ def save_seen(seen: dict[str, str], path: Path = DEFAULT_PATH) -> None:
 
 
 def filter_new(
-    opportunities: list[tuple[Opportunity, int]],
+    opportunities: Iterable[tuple[Opportunity, int]],
     seen: dict[str, str],
-) -> list[tuple[Opportunity, int]]:
-    return [(opp, score) for opp, score in opportunities if opp.id not in seen]
+) -> Iterator[tuple[Opportunity, int]]:
+    return ((opp, score) for opp, score in opportunities if opp.id not in seen)
 
 
 def mark_seen(
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import logging
+from collections import OrderedDict
+from collections.abc import Iterator
 from datetime import date
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from itertools import groupby
+from html import escape
 
 import requests
 
+from . import profiling
 from .config import Config
 from .sources.base import Opportunity
 
@@ -17,6 +21,62 @@ logger = logging.getLogger(__name__)
 TOKEN_URL = "https://oauth2.googleapis.com/token"
 SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
 
+EXCERPT_CHARS = 200
+# Rendered cards kept across digests, profiles and scheduler cycles
+CARD_CACHE_SIZE = 4096
+
+# (card digest, score) -> rendered card, least recently used first
+_cards: OrderedDict[tuple[bytes, int], str] = OrderedDict()
+
+# Templates are formatted with already-escaped values
+_HEADER = (
+    "<html><body>\n"
+    "<h1 style='color:#1a365d;font-family:sans-serif;'>\n"
+    "Weekly Funding Digest &mdash; {today}\n"
+    "</h1>\n"
+    "<p style='font-family:sans-serif;color:#555;'>{summary}</p>"
+).format
+_PARTIAL = (
+    "<p style='font-family:sans-serif;font-size:13px;color:#b7791f;background:#fffff0;padding:8px;"
+    "border:1px solid #f6e05e;border-radius:4px;'>"
+    "<strong>Partial digest:</strong> the run's time budget ran out before {sources} "
+    "finished. Their listings will be checked again on the next run.</p>"
+).format
+_SECTION = (
+    "<h2 style='color:#2c5282;font-family:sans-serif;border-bottom:1px solid #e2e8f0;padding-bottom:4px;'>"
+    "{source} ({count})</h2>"
+).format
+_CARD = (
+    "<div style='margin-bottom:16px;padding:12px;border:1px solid #e2e8f0;border-radius:6px;font-family:sans-serif;'>"
+    "<div style='font-size:16px;font-weight:bold;'>"
+    "<a href='{url}' style='color:#2b6cb0;text-decoration:none;'>{title}</a>"
+    "<span style='color:#718096;font-size:12px;font-weight:normal;margin-left:8px;'>Score: {score}</span>"
+    "</div>"
+    "<div style='font-size:13px;color:#555;margin-top:4px;'>"
+    "<strong>Deadline:</strong> {deadline}{amount}{organization}</div>{notes}{excerpt}</div>"
+).format
+_REMINDER = (
+    "<div style='margin-bottom:8px;padding:8px 12px;border-left:3px solid #dd6b20;font-family:sans-serif;'>"
+    "<a href='{url}' style='color:#2b6cb0;text-decoration:none;font-weight:bold;'>{title}</a>"
+    "<div style='font-size:13px;color:#555;margin-top:2px;'>"
+    "<strong>Deadline:</strong> {deadline} ({days}){organization}</div></div>"
+).format
+_AMOUNT = " &bull; <strong>Amount:</strong> {}".format
+_ORGANIZATION = " &bull; <strong>Org:</strong> {}".format
+_NOTES = (
+    "<div style='font-size:12px;color:#b7791f;background:#fffff0;padding:4px 8px;"
+    "border-radius:4px;margin-top:6px;border:1px solid #f6e05e;'>{}</div>"
+).format
+_EXCERPT = "<div style='font-size:13px;color:#666;margin-top:6px;'>{}</div>".format
+_FOOTER = (
+    "<hr style='border:none;border-top:1px solid #e2e8f0;margin-top:24px;'>"
+    "<p style='font-family:sans-serif;font-size:12px;color:#999;'>"
+    "Generated by fellowship-funding search. "
+    "Relevance scores are based on keyword matching and may not reflect actual fit."
+    "</p>"
+    "</body></html>"
+)
+
 
 def _get_access_token(config: Config) -> str:
     resp = requests.post(TOKEN_URL, data={
@@ -32,6 +92,8 @@ def _get_access_token(config: Config) -> str:
 def send_digest(
     opportunities: list[tuple[Opportunity, int]],
     config: Config,
+    skipped: list[str] | None = None,
+    reminders: list[tuple[Opportunity, int]] | None = None,
 ) -> None:
     if not config.gmail_refresh_token:
         logger.warning("No GMAIL_REFRESH_TOKEN set, skipping email")
@@ -40,12 +102,17 @@ def send_digest(
         logger.warning("Missing email addresses, skipping email")
         return
 
-    subject = (
-        f"Fellowship Digest: {len(opportunities)} new opportunities "
-        f"({date.today().strftime('%b %d, %Y')})"
-    )
+    partial = " (partial)" if skipped else ""
+    if opportunities or not reminders:
+        due = f", {len(reminders)} deadline reminders" if reminders else ""
+        counts = f"{len(opportunities)} new opportunities{due}"
+    else:
+        counts = f"{len(reminders)} deadline reminders"
+    subject = f"Fellowship Digest{partial}: {counts} ({date.today().strftime('%b %d, %Y')})"
 
-    html = _build_html(opportunities)
+    label = config.name or "default"
+    with profiling.stage(f"{label}-html"):
+        html = _build_html(opportunities, skipped, reminders)
 
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
@@ -53,80 +120,97 @@ def send_digest(
     msg["To"] = config.recipient_email
     msg.attach(MIMEText(html, "html"))
 
-    raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
+    with profiling.stage(f"{label}-send"):
+        raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
 
-    access_token = _get_access_token(config)
-    resp = requests.post(
-        SEND_URL,
-        headers={"Authorization": f"Bearer {access_token}"},
-        json={"raw": raw},
+        access_token = _get_access_token(config)
+        resp = requests.post(
+            SEND_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+            json={"raw": raw},
+        )
+        resp.raise_for_status()
+    logger.info(
+        "Email sent to %s with %d opportunities and %d reminders",
+        config.recipient_email, len(opportunities), len(reminders or []),
     )
-    resp.raise_for_status()
-    logger.info("Email sent to %s with %d opportunities", config.recipient_email, len(opportunities))
 
 
-def _build_html(opportunities: list[tuple[Opportunity, int]]) -> str:
-    parts = [
-        "<html><body>",
-        "<h1 style='color:#1a365d;font-family:sans-serif;'>",
-        f"Weekly Funding Digest &mdash; {date.today().strftime('%B %d, %Y')}",
-        "</h1>",
-        f"<p style='font-family:sans-serif;color:#555;'>{len(opportunities)} new opportunities found.</p>",
-    ]
+def _build_html(
+    opportunities: list[tuple[Opportunity, int]],
+    skipped: list[str] | None = None,
+    reminders: list[tuple[Opportunity, int]] | None = None,
+) -> str:
+    return "\n".join(_iter_html(opportunities, skipped, reminders))
 
-    grouped = groupby(
-        sorted(opportunities, key=lambda x: x[0].source),
-        key=lambda x: x[0].source,
-    )
 
-    for source_name, group in grouped:
-        items = list(group)
-        parts.append(
-            f"<h2 style='color:#2c5282;font-family:sans-serif;border-bottom:1px solid #e2e8f0;padding-bottom:4px;'>"
-            f"{source_name} ({len(items)})</h2>"
-        )
-
-        for opp, score in items:
-            deadline_str = opp.deadline.strftime("%b %d, %Y") if opp.deadline else "No deadline listed"
-            desc_excerpt = opp.description[:200] + "..." if len(opp.description) > 200 else opp.description
-
-            parts.append(
-                "<div style='margin-bottom:16px;padding:12px;border:1px solid #e2e8f0;border-radius:6px;font-family:sans-serif;'>"
-                f"<div style='font-size:16px;font-weight:bold;'>"
-                f"<a href='{opp.url}' style='color:#2b6cb0;text-decoration:none;'>{opp.title}</a>"
-                f"<span style='color:#718096;font-size:12px;font-weight:normal;margin-left:8px;'>Score: {score}</span>"
-                "</div>"
-                f"<div style='font-size:13px;color:#555;margin-top:4px;'>"
-                f"<strong>Deadline:</strong> {deadline_str}"
+def _iter_html(
+    opportunities: list[tuple[Opportunity, int]],
+    skipped: list[str] | None,
+    reminders: list[tuple[Opportunity, int]] | None = None,
+) -> Iterator[str]:
+    if opportunities or not reminders:
+        summary = f"{len(opportunities)} new opportunities found."
+    else:
+        summary = f"No new opportunities this week; {len(reminders)} upcoming deadlines below."
+    yield _HEADER(today=date.today().strftime("%B %d, %Y"), summary=summary)
+    if skipped:
+        yield _PARTIAL(sources=escape(", ".join(skipped)))
+
+    # Previously reported opportunities whose deadlines are coming up
+    if reminders:
+        yield _SECTION(source="Deadline reminders", count=len(reminders))
+        for opp, days_left in reminders:
+            yield _REMINDER(
+                url=escape(opp.url),
+                title=escape(opp.title),
+                deadline=opp.deadline.strftime("%b %d, %Y") if opp.deadline else "",
+                days="due today" if days_left == 0 else f"{days_left} day{'s' if days_left != 1 else ''} left",
+                organization=_ORGANIZATION(escape(opp.organization)) if opp.organization else "",
             )
 
-            if opp.amount:
-                parts.append(f" &bull; <strong>Amount:</strong> {opp.amount}")
-            if opp.organization:
-                parts.append(f" &bull; <strong>Org:</strong> {opp.organization}")
-
-            parts.append("</div>")
-
-            if opp.notes:
-                parts.append(
-                    f"<div style='font-size:12px;color:#b7791f;background:#fffff0;padding:4px 8px;"
-                    f"border-radius:4px;margin-top:6px;border:1px solid #f6e05e;'>{opp.notes}</div>"
-                )
-
-            if desc_excerpt:
-                parts.append(
-                    f"<div style='font-size:13px;color:#666;margin-top:6px;'>{desc_excerpt}</div>"
-                )
-
-            parts.append("</div>")
-
-    parts.append(
-        "<hr style='border:none;border-top:1px solid #e2e8f0;margin-top:24px;'>"
-        "<p style='font-family:sans-serif;font-size:12px;color:#999;'>"
-        "Generated by fellowship-funding search. "
-        "Relevance scores are based on keyword matching and may not reflect actual fit."
-        "</p>"
-        "</body></html>"
+    # Group in one pass, keeping each source's input order; only the section
+    # names need sorting
+    groups: dict[str, list[tuple[Opportunity, int]]] = {}
+    for item in opportunities:
+        groups.setdefault(item[0].source, []).append(item)
+
+    for source_name in sorted(groups):
+        items = groups[source_name]
+        yield _SECTION(source=escape(source_name), count=len(items))
+        for opp, score in items:
+            yield _card(opp, score)
+
+    yield _FOOTER
+
+
+def _card(opp: Opportunity, score: int) -> str:
+    # Keyed by a digest of exactly what the card shows, so the cache holds
+    # neither full descriptions nor copies of text kept in the blob store
+    description = opp.description
+    excerpt = description[:EXCERPT_CHARS] + "..." if len(description) > EXCERPT_CHARS else description
+    key = (_card_digest(opp, excerpt), score)
+    html = _cards.get(key)
+    if html is not None:
+        _cards.move_to_end(key)
+        return html
+    html = _CARD(
+        url=escape(opp.url),
+        title=escape(opp.title),
+        score=score,
+        deadline=opp.deadline.strftime("%b %d, %Y") if opp.deadline else "No deadline listed",
+        amount=_AMOUNT(escape(opp.amount)) if opp.amount else "",
+        organization=_ORGANIZATION(escape(opp.organization)) if opp.organization else "",
+        notes=_NOTES(escape(opp.notes)) if opp.notes else "",
+        excerpt=_EXCERPT(escape(excerpt)) if excerpt else "",
     )
+    _cards[key] = html
+    if len(_cards) > CARD_CACHE_SIZE:
+        _cards.popitem(last=False)
+    return html
+
 
-    return "\n".join(parts)
+def _card_digest(opp: Opportunity, excerpt: str) -> bytes:
+    deadline = opp.deadline.isoformat() if opp.deadline else ""
+    fields = (opp.url, opp.title, deadline, opp.amount, opp.organization, opp.notes, excerpt)
+    return hashlib.blake2b("\0".join(fields).encode(), digest_size=16).digest()
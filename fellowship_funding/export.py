@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import fields
+from datetime import date, datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import TextIO
+
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+OUTPUTS = ("email", "ndjson")
+STDOUT = "-"
+# Uncompressed characters per gzip part before rotating to a new file
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Field order and encoded keys are fixed once so each line is a plain join
+FIELDS = tuple(f.name for f in fields(Opportunity))
+_KEYS = tuple(json.dumps(name) + ":" for name in FIELDS)
+_values = attrgetter(*FIELDS)
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def parse_outputs(value: str) -> set[str]:
+    outputs = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = outputs - set(OUTPUTS)
+    if unknown or not outputs:
+        raise ValueError(f"Unknown output(s) {sorted(unknown)}; expected any of {list(OUTPUTS)}")
+    return outputs
+
+
+def to_line(opp: Opportunity, score: int, profile: str = "") -> str:
+    parts = [f'{{"profile":{_encode(profile)},"score":{score}']
+    for key, value in zip(_KEYS, _values(opp)):
+        if isinstance(value, date):
+            value = value.isoformat()
+        parts.append(key + _encode(value))
+    return ",".join(parts) + "}\n"
+
+
+class NdjsonSink:
+    # Writes one JSON object per scored opportunity as the pipeline yields
+    # them, to stdout or to size-rotated gzip parts next to `target`
+    def __init__(self, target: str = STDOUT, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.target = target
+        self.max_bytes = max_bytes
+        self.lines = 0
+        self.parts: list[Path] = []
+        self._file: TextIO | None = None
+        self._written = 0
+        self._stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    def __enter__(self) -> NdjsonSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def tap(self, scored: Iterable[tuple[Opportunity, int]], profile: str = "") -> Iterator[tuple[Opportunity, int]]:
+        for opp, score in scored:
+            self.write(opp, score, profile)
+            yield opp, score
+
+    def write(self, opp: Opportunity, score: int, profile: str = "") -> None:
+        line = to_line(opp, score, profile)
+        if self.target == STDOUT:
+            sys.stdout.write(line)
+        else:
+            if self._file is None or self._written >= self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._written += len(line)
+        self.lines += 1
+
+    def close(self) -> None:
+        if self.target == STDOUT:
+            sys.stdout.flush()
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+        where = "stdout" if self.target == STDOUT else ", ".join(str(p) for p in self.parts) or "nowhere"
+        logger.info("Exported %d scored opportunities to %s", self.lines, where)
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        base = Path(self.target)
+        stem = base.name.removesuffix(".gz").removesuffix(".ndjson")
+        path = base.with_name(f"{stem}-{self._stamp}-{len(self.parts):03d}.ndjson.gz")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._written = 0
+        self.parts.append(path)
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import argparse
+import contextlib
 import logging
 import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 
-from .config import load_config
-from .dedup import filter_new, load_seen, mark_seen, save_seen
-from .email import send_digest
-from .scoring import score_and_filter
-from .sources import ALL_SOURCES
+from . import checkpoints, corpus, export, profiling, shards
+from .config import Config, load_profiles
+from .pipeline import (
+    SourceKey,
+    deliver,
+    fetch_sources,
+    fetch_units,
+    filter_unseen,
+    profile_opportunities,
+    record_yield,
+    score_candidates,
+    score_profile,
+    shard_keys,
+)
+from .sources import blobstore, parsepool
 from .sources.base import Opportunity
+from .sources.budget import Budget
+from .sources.health import SourceHealth, load_health, save_health
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,67 +33,290 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    config = load_config()
-    logger.info("Loaded config with %d keywords", len(config.keywords))
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if args.profile is not None:
+        profiling.configure(Path(args.profile) if args.profile else profiling.default_run_dir())
+    store = None
+    if args.blob_store is not None:
+        store = blobstore.activate(Path(args.blob_store or blobstore.DEFAULT_PATH))
+    try:
+        _dispatch(args)
+    finally:
+        if store is not None:
+            store.close()
+
+
+def _dispatch(args: argparse.Namespace) -> None:
+    if args.command == "search":
+        search(args)
+    elif args.command == "serve-scheduler":
+        serve_scheduler(args)
+    elif args.command == "serve":
+        from .server import serve
+
+        serve(args.host, args.port)
+    elif args.command == "merge":
+        merge(args.artifacts or sorted(shards.DEFAULT_DIR.glob("shard-*.json.gz")), args.output,
+              args.ndjson_path, args.resume)
+    else:
+        run(parse_workers=args.parse_workers, time_budget=args.time_budget, shard=args.shard,
+            outputs=args.output, ndjson_path=args.ndjson_path, resume=args.resume, run_id=args.run_id)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="fellowship_funding")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Worker processes for HTML parsing (default: 0, parse inline)")
+    parser.add_argument("--time-budget", type=float, default=0,
+                        help="Wall-clock seconds allowed for fetching; sources still running "
+                             "are cut off and the digest is marked partial (default: 0, no limit)")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="DIR",
+                        help="Write cProfile stats, collapsed stacks and allocation reports per stage "
+                             "to DIR (default: data/profiles/<timestamp>)")
+    parser.add_argument("--blob-store", nargs="?", const="", default=None, metavar="PATH",
+                        help="Keep long description/eligibility text in a memory-mapped file instead "
+                             "of in memory, loading it on access (default: data/blobs.bin)")
+    parser.add_argument("--shard", type=shards.parse_shard, metavar="i/N",
+                        help="Fetch and score only shard i of N and write a partial-results artifact "
+                             "to data/shards/ instead of sending digests; combine with 'merge'")
+    parser.add_argument("--run-id", default="", metavar="ID",
+                        help="Label for this run's shard artifacts; give every --shard process of one "
+                             "run the same ID so 'merge' combines only them (default: the UTC date)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the latest failed run for the same profiles from its last "
+                             "completed stage (fetched, scored, new, sent) instead of starting over")
+    parser.add_argument("--output", type=export.parse_outputs, default={"email"}, metavar="email,ndjson",
+                        help="Where results go: the email digest, an NDJSON stream of every scored "
+                             "opportunity, or both (default: email). Seen state only advances with email")
+    parser.add_argument("--ndjson-path", default=export.STDOUT, metavar="PATH",
+                        help="NDJSON destination: '-' for stdout, or a path whose rotating "
+                             "gzip parts are written alongside it (default: -)")
+    commands = parser.add_subparsers(dest="command")
+
+    search_cmd = commands.add_parser("search", help="Query the local opportunity corpus")
+    search_cmd.add_argument("query")
+    search_cmd.add_argument("--days", type=int, default=0,
+                            help="Only show deadlines at least this many days out (default: 0)")
+    search_cmd.add_argument("--source", default="", help="Restrict to one source name")
+    search_cmd.add_argument("--limit", type=int, default=20)
+
+    scheduler_cmd = commands.add_parser(
+        "serve-scheduler", help="Run as a daemon, polling each source on its own cadence",
+    )
+    scheduler_cmd.add_argument("--cadence", action="append", default=[], metavar="SOURCE=HOURS",
+                               help="Override a source's polling interval (repeatable)")
+    scheduler_cmd.add_argument("--digest-hours", type=float, default=168.0,
+                               help="Hours between digests (default: 168)")
+    scheduler_cmd.add_argument("--tick-seconds", type=float, default=60.0)
 
-    # Fetch from all sources
-    all_opportunities: list[Opportunity] = []
-    for source_cls in ALL_SOURCES:
-        source_name = source_cls.name
+    serve_cmd = commands.add_parser("serve", help="Serve a read-only JSON API over the local corpus")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+
+    merge_cmd = commands.add_parser("merge", help="Combine --shard artifacts, then send digests and update state")
+    merge_cmd.add_argument("artifacts", nargs="*", type=Path,
+                           help="Shard artifacts (default: data/shards/shard-*.json.gz)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve-scheduler":
+        from .scheduler import parse_cadence
+
+        try:
+            args.cadence = parse_cadence(args.cadence)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def run(
+    parse_workers: int = 0,
+    time_budget: float = 0,
+    shard: tuple[int, int] | None = None,
+    outputs: set[str] = frozenset({"email"}),
+    ndjson_path: str = export.STDOUT,
+    resume: bool = False,
+    run_id: str = "",
+) -> None:
+    configs = load_profiles()
+    logger.info("Loaded %d profile(s)", len(configs))
+
+    health = load_health()
+    checkpoint = checkpoints.Checkpoint(configs, resume and shard is None)
+    saved = checkpoint.load(checkpoints.FETCHED)
+    if saved is not None:
+        fetched, skipped = shards.decode_fetched(saved["units"]), saved["skipped"]
+    else:
+        budget = Budget(time_budget) if time_budget > 0 else None
+        parsepool.configure(parse_workers)
         try:
-            source = _init_source(source_cls, config)
-            opps = source.fetch()
-            all_opportunities.extend(opps)
-            logger.info("✓ %s: %d opportunities", source_name, len(opps))
-        except Exception:
-            logger.exception("✗ %s: failed to initialize", source_name)
-
-    logger.info("Total fetched: %d opportunities", len(all_opportunities))
-
-    # Score and filter
-    scored = score_and_filter(all_opportunities, config)
-    logger.info("After scoring (threshold=%d): %d opportunities", config.score_threshold, len(scored))
-
-    # Dedup
-    seen = load_seen()
-    new_opps = filter_new(scored, seen)
-    logger.info("New (unseen) opportunities: %d", len(new_opps))
-
-    if not new_opps:
-        logger.info("No new opportunities to report. Done.")
+            fetched, skipped = fetch_sources(configs, health, budget, shard)
+        finally:
+            parsepool.shutdown()
+    logger.info("Total fetched: %d opportunities", sum(len(opps) for opps in fetched.values()))
+    if skipped:
+        logger.warning("Time budget exhausted; continuing without: %s", ", ".join(skipped))
+
+    if shard is not None:
+        # Shared state (seen, history, health) is left for the merge step
+        result = shards.ShardResult(
+            *shard, fetched=fetched, skipped=skipped,
+            run_id=run_id or datetime.now(timezone.utc).strftime(shards.RUN_ID_FORMAT),
+            fingerprint=checkpoints.fingerprint(configs),
+        )
+        result.health = {name: health[name] for name, _ in fetched if name in health}
+        result.scores = {
+            config.name: score_candidates(config, profile_opportunities(config, fetched)) for config in configs
+        }
+        shards.write_shard(result, shards.shard_path(*shard))
         return
 
-    # Send email
+    if saved is None:
+        checkpoint.save(checkpoints.FETCHED, {"units": shards.encode_fetched(fetched), "skipped": skipped})
+    report(configs, fetched, skipped, health, checkpoint, outputs=outputs, ndjson_path=ndjson_path,
+           record_yields=saved is None)
+
+
+def merge(
+    paths: list[Path],
+    outputs: set[str] = frozenset({"email"}),
+    ndjson_path: str = export.STDOUT,
+    resume: bool = False,
+) -> None:
+    configs = load_profiles()
+    artifacts = []
+    for path in paths:
+        try:
+            artifacts.append((path, shards.read_shard(path)))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable shard artifact %s: %s", path, e)
+    artifacts = shards.current_run(artifacts, checkpoints.fingerprint(configs))
+    if not artifacts:
+        logger.error("No shard artifacts to merge")
+        sys.exit(1)
+
+    health = load_health()
+    fetched: dict[SourceKey, list[Opportunity]] = {}
+    skipped: list[str] = []
+    scores: dict[str, dict[str, int]] = {}
+    present: set[int] = set()
+    count = artifacts[0][1].count
+    for path, result in artifacts:
+        logger.info("Merging shard %d/%d of run %s from %s", result.index, result.count, result.run_id, path)
+        present.add(result.index)
+        fetched.update(result.fetched)
+        skipped += [name for name in result.skipped if name not in skipped]
+        health.update(result.health)
+        for profile, profile_scores in result.scores.items():
+            scores.setdefault(profile, {}).update(profile_scores)
+
+    # A shard that never reported makes the digest partial, like a budget cut-off
+    units = fetch_units(configs)
+    for index in sorted(set(range(count)) - present):
+        logger.warning("Shard %d/%d is missing", index, count)
+        for key in shard_keys(units, index, count):
+            name = units[key][0].display_name
+            if name not in skipped:
+                skipped.append(name)
+
+    report(configs, fetched, skipped, health, checkpoints.Checkpoint(configs, resume), scores, outputs, ndjson_path)
+    # report() exits on a failed delivery, keeping the artifacts for a retry
+    for path, _ in artifacts:
+        path.unlink(missing_ok=True)
+
+
+def report(
+    configs: list[Config],
+    fetched: dict[SourceKey, list[Opportunity]],
+    skipped: list[str],
+    health: dict[str, SourceHealth],
+    checkpoint: checkpoints.Checkpoint,
+    scores: dict[str, dict[str, int]] | None = None,
+    outputs: set[str] = frozenset({"email"}),
+    ndjson_path: str = export.STDOUT,
+    record_yields: bool = True,
+) -> None:
     try:
-        send_digest(new_opps, config)
+        with profiling.stage("corpus"):
+            corpus.upsert([opp for opps in fetched.values() for opp in opps])
     except Exception:
-        logger.exception("Failed to send digest email")
+        logger.exception("Failed to update opportunity corpus")
+
+    failed = False
+    new_ids: set[str] = set()
+    with export.NdjsonSink(ndjson_path) if "ndjson" in outputs else contextlib.nullcontext() as sink:
+        for config in configs:
+            sent = checkpoint.load(checkpoints.SENT, config.name) is not None
+            saved = None if sent else checkpoint.load(checkpoints.NEW, config.name)
+            # The NDJSON stream covers every profile, even those resumed past scoring
+            if sink is not None or (not sent and saved is None):
+                profile_scores = scores.get(config.name) if scores is not None else None
+                scored = _scored(config, fetched, checkpoint, profile_scores, sink)
+            if sent:
+                logger.info("[%s] Digest already sent in this run, skipping", config.name or "default")
+                continue
+
+            if saved is not None:
+                new_opps = checkpoints.decode_scored(saved)
+            else:
+                new_opps = filter_unseen(config, scored)
+                checkpoint.save(checkpoints.NEW, checkpoints.encode_scored(new_opps), config.name)
+            new_ids.update(opp.id for opp, _ in new_opps)
+
+            # Without the email digest nothing was reported, so seen state stays put
+            if "email" not in outputs:
+                continue
+            if deliver(config, new_opps, skipped):
+                checkpoint.save(checkpoints.SENT, True, config.name)
+            else:
+                failed = True
+    if record_yields:
+        record_yield(fetched, new_ids, health)
+    save_health(health)
+
+    if failed:
+        logger.info("Checkpoints kept in %s; rerun with --resume to retry delivery", checkpoint.dir)
         sys.exit(1)
+    checkpoint.clear()
+    checkpoint.prune()
 
-    # Update seen tracker only after successful send
-    updated_seen = mark_seen(new_opps, seen)
-    save_seen(updated_seen)
 
-    logger.info("Done. Sent %d new opportunities.", len(new_opps))
+def _scored(
+    config: Config,
+    fetched: dict[SourceKey, list[Opportunity]],
+    checkpoint: checkpoints.Checkpoint,
+    scores: dict[str, int] | None,
+    sink: export.NdjsonSink | None,
+) -> list[tuple[Opportunity, int]]:
+    saved = checkpoint.load(checkpoints.SCORED, config.name)
+    if saved is not None:
+        scored = checkpoints.decode_scored(saved)
+        return list(sink.tap(scored, config.name)) if sink is not None else scored
+    scored = list(score_profile(config, profile_opportunities(config, fetched), scores, sink))
+    checkpoint.save(checkpoints.SCORED, checkpoints.encode_scored(scored), config.name)
+    return scored
 
 
-def _init_source(source_cls: type, config):
-    name = source_cls.__name__
-    if name == "UCLASource":
-        return source_cls(disciplines=config.disciplines, academic_level=config.academic_level)
-    elif name == "UCISource":
-        return source_cls(academic_level=config.academic_level)
-    elif name == "ZintellectSource":
-        return source_cls(
-            keywords=config.keywords,
-            academic_level=config.academic_level,
-            citizenship=config.citizenship,
-        )
-    elif name == "PathwaysSource":
-        return source_cls(keywords=config.keywords)
-    else:
-        return source_cls()
+def serve_scheduler(args: argparse.Namespace) -> None:
+    from .scheduler import Scheduler
+
+    configs = load_profiles()
+    parsepool.configure(args.parse_workers)
+    try:
+        Scheduler(configs, args.cadence, args.digest_hours).run_forever(args.tick_seconds)
+    finally:
+        parsepool.shutdown()
+
+
+def search(args: argparse.Namespace) -> None:
+    deadline_after = date.today() + timedelta(days=args.days)
+    results = corpus.search(args.query, deadline_after=deadline_after, source=args.source, limit=args.limit)
+    for opp, rank in results:
+        deadline_str = opp.deadline.isoformat() if opp.deadline else "no deadline"
+        print(f"{rank:8.2f}  {deadline_str:<11}  [{opp.source}] {opp.title}")
+        print(f"          {opp.url}")
+    if not results:
+        print("No matching opportunities in the local corpus.")
 
 
 if __name__ == "__main__":
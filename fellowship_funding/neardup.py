@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import re
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+from .dedup import MAX_AGE_DAYS, profile_path
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("data/signatures.json")
+
+# 16 bands x 4 rows puts the LSH candidate threshold near Jaccard 0.5;
+# candidates are then confirmed against SIMILARITY_THRESHOLD
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.6
+SHINGLE_SIZE = 4
+
+# XOR with fixed random masks stands in for the permutations: much cheaper than
+# (a * h + b) % p in pure Python and close enough for near-duplicate detection
+_rng = random.Random(0x5EED)
+_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+
+URL_NOISE = {"http", "https", "www", "com", "org", "edu", "gov", "html", "htm", "aspx", "php", "index"}
+
+Signature = tuple[int, ...]
+# Deadline (ISO string or "") and normalized organization; a signature match
+# only counts when these corroborate it
+Evidence = tuple[str, str]
+# ID -> (date reported, signature, evidence)
+History = dict[str, tuple[str, Signature, Evidence]]
+
+
+class LSHIndex:
+    def __init__(self) -> None:
+        self.signatures: dict[str, Signature] = {}
+        self._buckets: list[dict[Signature, list[str]]] = [{} for _ in range(BANDS)]
+
+    def add(self, key: str, sig: Signature) -> None:
+        self.signatures[key] = sig
+        for band, bucket in zip(_bands(sig), self._buckets):
+            bucket.setdefault(band, []).append(key)
+
+    def query(self, sig: Signature) -> set[str]:
+        # Keys sharing at least one band whose estimated similarity clears the threshold
+        candidates: set[str] = set()
+        for band, bucket in zip(_bands(sig), self._buckets):
+            candidates.update(bucket.get(band, ()))
+        return {key for key in candidates if similarity(sig, self.signatures[key]) >= SIMILARITY_THRESHOLD}
+
+
+def signature(opp: Opportunity) -> Signature:
+    hashes = [_hash(s) for s in shingles(opp)] or [0]
+    return tuple(min([h ^ mask for h in hashes]) for mask in _MASKS)
+
+
+def shingles(opp: Opportunity) -> set[str]:
+    title = _normalize(opp.title)
+    result = {title[i:i + SHINGLE_SIZE] for i in range(max(len(title) - SHINGLE_SIZE + 1, 1))}
+    result.update(f"org:{token}" for token in _normalize(opp.organization).split())
+
+    # Listing pages share host and path across records; the query or
+    # fragment is often what identifies the record
+    parsed = urlparse(opp.url)
+    url_tokens = re.split(r"[^a-z0-9]+", f"{parsed.netloc} {parsed.path} {parsed.query} {parsed.fragment}".lower())
+    result.update(f"url:{token}" for token in url_tokens if token and token not in URL_NOISE)
+    result.discard("")
+    return result
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def evidence(opp: Opportunity) -> Evidence:
+    return (opp.deadline.isoformat() if opp.deadline else "", _normalize(opp.organization))
+
+
+def corroborated(a: Evidence, b: Evidence) -> bool:
+    # Similar wording alone can't tell a funder's predoctoral award from its
+    # dissertation award; the records must also share a deadline or organization
+    # and must not list different deadlines
+    (deadline_a, org_a), (deadline_b, org_b) = a, b
+    if deadline_a and deadline_b and deadline_a != deadline_b:
+        return False
+    return bool(deadline_a and deadline_a == deadline_b) or bool(org_a and org_a == org_b)
+
+
+def collapse(scored: Iterable[tuple[Opportunity, int]]) -> list[tuple[Opportunity, int]]:
+    # Runs on scored records so each cluster keeps its best-scoring member
+    index = LSHIndex()
+    parent: dict[str, str] = {}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    by_id: dict[str, tuple[Opportunity, int]] = {}
+    evidences: dict[str, Evidence] = {}
+    for opp, score in scored:
+        if opp.id in by_id:
+            continue
+        by_id[opp.id] = (opp, score)
+        parent[opp.id] = opp.id
+        evidences[opp.id] = evidence(opp)
+        sig = signature(opp)
+        for match in index.query(sig):
+            if corroborated(evidences[opp.id], evidences[match]):
+                parent[find(match)] = find(opp.id)
+        index.add(opp.id, sig)
+
+    clusters: dict[str, list[tuple[Opportunity, int]]] = {}
+    for opp_id, item in by_id.items():
+        clusters.setdefault(find(opp_id), []).append(item)
+
+    # Highest score wins, then the most informative record; original order is kept
+    keep = {max(members, key=lambda item: (item[1], _richness(item[0])))[0].id for members in clusters.values()}
+    result = [item for opp_id, item in by_id.items() if opp_id in keep]
+    if len(result) < len(by_id):
+        logger.info("Near-dup: collapsed %d opportunities into %d", len(by_id), len(result))
+    return result
+
+
+def load_history(path: Path = DEFAULT_PATH) -> History:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+        return {
+            k: (v["date"], tuple(v["sig"]), (v.get("deadline", ""), v.get("org", "")))
+            for k, v in data.items() if len(v.get("sig", ())) == NUM_PERM
+        }
+    except (json.JSONDecodeError, OSError, AttributeError, KeyError, TypeError):
+        logger.warning("Could not read %s, starting fresh", path)
+        return {}
+
+
+def save_history(history: History, path: Path = DEFAULT_PATH) -> None:
+    cutoff = (date.today() - timedelta(days=MAX_AGE_DAYS)).isoformat()
+    pruned = {
+        k: {"date": d, "sig": list(sig), "deadline": deadline, "org": org}
+        for k, (d, sig, (deadline, org)) in history.items() if d >= cutoff
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(pruned, separators=(",", ":")) + "\n")
+
+
+def filter_history(
+    opportunities: Iterable[tuple[Opportunity, int]],
+    history: History,
+) -> Iterator[tuple[Opportunity, int]]:
+    # Entries saved before evidence was recorded can't corroborate a match
+    index = LSHIndex()
+    for key, (_, sig, _) in history.items():
+        index.add(key, sig)
+
+    for opp, score in opportunities:
+        found = evidence(opp)
+        matches = {
+            key for key in index.query(signature(opp)) - {opp.id}
+            if corroborated(found, history[key][2])
+        }
+        if matches:
+            logger.info("Near-dup: %s already reported as %s", opp.id, sorted(matches)[0])
+            continue
+        yield opp, score
+
+
+def record_history(
+    opportunities: list[tuple[Opportunity, int]],
+    history: History,
+) -> History:
+    # Only what was delivered; records collapsed away were never reported
+    today = date.today().isoformat()
+    updated = dict(history)
+    for opp, _ in opportunities:
+        updated[opp.id] = (today, signature(opp), evidence(opp))
+    return updated
+
+
+def history_path(profile: str = "") -> Path:
+    return profile_path(DEFAULT_PATH, profile)
+
+
+def _bands(sig: Signature) -> list[Signature]:
+    return [sig[i:i + ROWS] for i in range(0, NUM_PERM, ROWS)]
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def _richness(opp: Opportunity) -> tuple[bool, int]:
+    return (opp.deadline is not None, len(opp.description))
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import replace
+
+from . import corpus, neardup, profiling, reminders
+from .config import Config
+from .dedup import filter_new, load_seen, mark_seen, save_seen, seen_path
+from .export import NdjsonSink
+from .scoring import iter_scored, prefilter, score_opportunity, select_digest
+from .sources import SourceSpec, select
+from .sources.base import Opportunity, Source
+from .sources.budget import Budget
+from .sources.health import SourceHealth
+
+logger = logging.getLogger(__name__)
+
+# (registry name, canonical JSON of constructor kwargs) — one fetch per unique key
+SourceKey = tuple[str, str]
+
+
+def fetch_sources(
+    configs: list[Config],
+    health: dict[str, SourceHealth],
+    budget: Budget | None = None,
+    shard: tuple[int, int] | None = None,
+) -> tuple[dict[SourceKey, list[Opportunity]], list[str]]:
+    # Fetch each source once per unique set of constructor parameters, most
+    # productive sources first so a tight budget drops the least useful ones.
+    # Returns the completed fetches and the names of sources the budget cut off.
+    units = fetch_units(configs)
+    if shard is not None:
+        units = {key: units[key] for key in shard_keys(units, *shard)}
+
+    fetched: dict[SourceKey, list[Opportunity]] = {}
+    for key, (spec, config) in sorted(units.items(), key=lambda item: _priority(health.get(item[0][0]))):
+        opps = fetch_one(spec, config, health, budget=budget)
+        if opps is not None:
+            fetched[key] = opps
+    return fetched, list(budget.skipped) if budget is not None else []
+
+
+def fetch_units(configs: list[Config]) -> dict[SourceKey, tuple[SourceSpec, Config]]:
+    units: dict[SourceKey, tuple[SourceSpec, Config]] = {}
+    for config in configs:
+        for spec, key in zip(select(config.sources, config.disabled_sources), source_keys(config)):
+            units.setdefault(key, (spec, config))
+    return units
+
+
+def shard_keys(units: dict[SourceKey, tuple[SourceSpec, Config]], index: int, count: int) -> list[SourceKey]:
+    # Every worker sees the same profiles, so sorting the keys gives each one
+    # the same deterministic round-robin split
+    return sorted(units)[index::count]
+
+
+def fetch_one(
+    spec: SourceSpec,
+    config: Config,
+    health: dict[str, SourceHealth],
+    source: Source | None = None,
+    budget: Budget | None = None,
+) -> list[Opportunity] | None:
+    # None means the source didn't run to completion (circuit open, failed
+    # to initialize, or cut off by the budget)
+    source_health = health.setdefault(spec.name, SourceHealth(spec.name))
+    if source_health.is_open():
+        logger.warning("✗ %s: circuit open, skipping", spec.name)
+        return None
+
+    source_name = spec.name
+    try:
+        if source is None:
+            source = spec.load()(**source_kwargs(spec, config))
+        source_name = source.name
+        if budget is not None and budget.expired():
+            budget.skip(source_name)
+            return None
+        if budget is not None:
+            # A fetch cut off by the budget keeps running on its abandoned
+            # thread, so it records into a copy that is kept only on completion
+            source_health = replace(source_health, latencies=list(source_health.latencies))
+        source.health = source_health
+        source.budget = budget
+        start = time.monotonic()
+        opps = _fetch(source, spec.name) if budget is None else _fetch_within(source, spec.name, budget)
+        if opps is None or (budget is not None and source_name in budget.skipped):
+            return None
+        health[spec.name] = source_health
+        source_health.fetch_seconds = round(time.monotonic() - start, 3)
+        logger.info("✓ %s: %d opportunities", source_name, len(opps))
+        return opps
+    except Exception:
+        logger.exception("✗ %s: failed to initialize", source_name)
+        return None
+
+
+def _fetch(source: Source, name: str) -> list[Opportunity]:
+    # Profiled on the thread that actually does the fetching
+    with profiling.stage(f"fetch-{name}"):
+        return source.fetch()
+
+
+def _fetch_within(source: Source, name: str, budget: Budget) -> list[Opportunity] | None:
+    # Run the fetch on a daemon thread so a hung source can be abandoned when
+    # the budget runs out; its next request then fails fast via the budget check
+    result: list[Opportunity] = []
+    thread = threading.Thread(
+        target=lambda: result.extend(_fetch(source, name)), name=f"fetch-{name}", daemon=True,
+    )
+    thread.start()
+    thread.join(budget.remaining())
+    if thread.is_alive():
+        budget.skip(source.name)
+        return None
+    return result
+
+
+def _priority(health: SourceHealth | None) -> tuple[bool, float]:
+    # Unmeasured sources go first so they get a yield estimate
+    if health is None or health.yield_rate is None:
+        return (False, 0.0)
+    return (True, -health.yield_rate)
+
+
+def record_yield(
+    fetched: dict[SourceKey, list[Opportunity]],
+    new_ids: set[str],
+    health: dict[str, SourceHealth],
+) -> None:
+    for (name, _), opps in fetched.items():
+        if name in health:
+            health[name].record_yield(sum(opp.id in new_ids for opp in opps))
+
+
+def source_keys(config: Config) -> list[SourceKey]:
+    return [
+        (spec.name, json.dumps(source_kwargs(spec, config), sort_keys=True))
+        for spec in select(config.sources, config.disabled_sources)
+    ]
+
+
+def source_kwargs(spec: SourceSpec, config: Config) -> dict:
+    return {kwarg: getattr(config, field) for kwarg, field in spec.params.items()}
+
+
+def profile_skipped(config: Config, skipped: list[str]) -> list[str]:
+    names = {spec.display_name for spec in select(config.sources, config.disabled_sources)}
+    return [name for name in skipped if name in names]
+
+
+def profile_opportunities(
+    config: Config,
+    fetched: dict[SourceKey, list[Opportunity]],
+) -> list[Opportunity]:
+    return [opp for key in source_keys(config) for opp in fetched.get(key, [])]
+
+
+def score_candidates(config: Config, opportunities: list[Opportunity]) -> dict[str, int]:
+    # Pre-filter and score without thresholding, for a shard to hand to merge;
+    # merge applies the threshold and then collapses near-duplicates across shards
+    label = config.name or "default"
+    with profiling.stage(f"{label}-score"):
+        return {opp.id: score_opportunity(opp, config) for opp in prefilter(opportunities, config)}
+
+
+def find_new(
+    config: Config,
+    opportunities: list[Opportunity],
+    scores: dict[str, int] | None = None,
+    sink: NdjsonSink | None = None,
+) -> list[tuple[Opportunity, int]]:
+    return filter_unseen(config, score_profile(config, opportunities, scores, sink))
+
+
+def score_profile(
+    config: Config,
+    opportunities: list[Opportunity],
+    scores: dict[str, int] | None = None,
+    sink: NdjsonSink | None = None,
+) -> Iterable[tuple[Opportunity, int]]:
+    # `scores` comes from score_candidates on the shards; the records it
+    # covers are already pre-filtered. Every record that survives collapsing
+    # also streams to `sink`, whether or not it was seen before.
+    label = config.name or "default"
+
+    # Drop expired and zero-signal records before full scoring
+    with profiling.stage(f"{label}-prefilter"):
+        if scores is None:
+            candidates = prefilter(opportunities, config)
+        else:
+            candidates = [opp for opp in opportunities if opp.id in scores]
+    logger.info("[%s] After pre-filter: %d of %d opportunities", label, len(candidates), len(opportunities))
+
+    # Only records above the threshold are kept past scoring
+    with profiling.stage(f"{label}-score"):
+        if scores is None:
+            scored = list(iter_scored(candidates, config))
+        else:
+            scored = [(opp, scores[opp.id]) for opp in candidates if scores[opp.id] >= config.score_threshold]
+
+    # Collapse cross-source near-duplicates, keeping the best-scoring record of each
+    with profiling.stage(f"{label}-neardup"):
+        scored = neardup.collapse(scored)
+    if sink is not None:
+        return sink.tap(scored, config.name)
+    return scored
+
+
+def filter_unseen(config: Config, scored: Iterable[tuple[Opportunity, int]]) -> list[tuple[Opportunity, int]]:
+    # Drop anything already reported under the same or a near-duplicate ID
+    # Both filters stream; only the records that pass are collected
+    label = config.name or "default"
+    with profiling.stage(f"{label}-dedup"):
+        unseen = filter_new(scored, load_seen(seen_path(config.name)))
+        history = neardup.load_history(neardup.history_path(config.name))
+        new_opps = list(neardup.filter_history(unseen, history))
+    logger.info(
+        "[%s] New (unseen) opportunities above threshold %d: %d",
+        label, config.score_threshold, len(new_opps),
+    )
+    return new_opps
+
+
+def deliver(
+    config: Config,
+    new_opps: list[tuple[Opportunity, int]],
+    skipped: list[str] | None = None,
+) -> bool:
+    label = config.name or "default"
+    # Only sources this profile uses make its digest partial
+    skipped = profile_skipped(config, skipped or [])
+
+    # Keep only what fits the digest budget
+    with profiling.stage(f"{label}-select"):
+        new_opps = select_digest(new_opps, config)
+
+    path = seen_path(config.name)
+    reminder_path = reminders.reminders_path(config.name)
+    index = reminders.load_reminders(reminder_path)
+    seeded = index is None
+    if seeded:
+        index = _seed_reminders(config, load_seen(path))
+    pending = len(index)
+    due = index.pop_due()
+
+    if not new_opps and not due:
+        # Keep a fresh backfill, and entries whose deadlines passed unsent,
+        # so the next run doesn't redo either
+        if seeded or len(index) != pending:
+            reminders.save_reminders(index, reminder_path)
+        logger.info("[%s] No new opportunities to report. Done.", label)
+        return True
+
+    # Send email
+    try:
+        from .email import send_digest
+
+        send_digest(new_opps, config, skipped, due)
+    except Exception:
+        logger.exception("[%s] Failed to send digest email", label)
+        return False
+
+    # Update seen tracker and reminder index only after successful send;
+    # records cut by the digest budget stay unmarked and can surface in a
+    # later digest, and unsent reminders come due again next run
+    save_seen(mark_seen(new_opps, load_seen(path)), path)
+    history_path = neardup.history_path(config.name)
+    neardup.save_history(neardup.record_history(new_opps, neardup.load_history(history_path)), history_path)
+    index.schedule((opp for opp, _ in new_opps), config.reminder_days)
+    reminders.save_reminders(index, reminder_path)
+
+    logger.info("[%s] Done. Sent %d new opportunities and %d reminders.", label, len(new_opps), len(due))
+    return True
+
+
+def _seed_reminders(config: Config, seen: dict[str, str]) -> reminders.ReminderIndex:
+    # One-time backfill for profiles reported on before the index existed.
+    # The corpus already holds this run's fetch, plus earlier runs' records
+    # where it persists (the workflow caches it between runs)
+    index = reminders.ReminderIndex()
+    if seen:
+        added = index.schedule((opp for opp in corpus.load_all() if opp.id in seen), config.reminder_days)
+        logger.info("[%s] Seeded reminder index with %d entries", config.name or "default", added)
+    return index
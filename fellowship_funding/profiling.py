@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+    import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path("data/profiles")
+TRACE_FRAMES = 25
+TOP_ALLOCATIONS = 30
+# Collapsed-stack paths deeper than this, or lighter than one microsecond, are dropped
+MAX_STACK_DEPTH = 64
+
+_run_dir: Path | None = None
+_sequence = itertools.count(1)
+_lock = threading.Lock()
+_disabled = nullcontext()
+
+
+def configure(run_dir: Path | None) -> None:
+    global _run_dir
+    _run_dir = run_dir
+    if run_dir is None:
+        return
+    import tracemalloc
+
+    run_dir.mkdir(parents=True, exist_ok=True)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+    (run_dir / "summary.tsv").write_text("stage\tseconds\tpeak_kib\tnet_kib\n")
+    logger.info("Profiling enabled, writing to %s", run_dir)
+
+
+def default_run_dir() -> Path:
+    return DEFAULT_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def stage(name: str) -> AbstractContextManager:
+    # Disabled profiling costs one global lookup per stage
+    if _run_dir is None:
+        return _disabled
+    return _profile(_run_dir, name)
+
+
+@contextmanager
+def _profile(run_dir: Path, name: str) -> Iterator[None]:
+    import cProfile
+    import tracemalloc
+
+    with _lock:
+        prefix = f"{next(_sequence):02d}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}"
+
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    start_size = tracemalloc.get_traced_memory()[0]
+
+    profiler: cProfile.Profile | None = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Only one profiler can be active per process; e.g. a fetch the
+        # time budget abandoned may still be running with its own
+        logger.warning("Profiler busy, recording %s without cProfile", name)
+        profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        size, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        try:
+            _write_reports(run_dir, prefix, profiler, before, after)
+            with (run_dir / "summary.tsv").open("a") as f:
+                f.write(f"{name}\t{elapsed:.3f}\t{peak / 1024:.0f}\t{(size - start_size) / 1024:.0f}\n")
+        except OSError:
+            logger.exception("Failed to write profile for %s", name)
+
+
+def _write_reports(
+    run_dir: Path,
+    prefix: str,
+    profiler: cProfile.Profile | None,
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+) -> None:
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    if profiler is not None:
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(run_dir / f"{prefix}.pstats")
+        (run_dir / f"{prefix}.collapsed").write_text(
+            "".join(f"{stack} {weight}\n" for stack, weight in _collapsed_stacks(stats).items())
+        )
+
+    # Ignore the profiler's own bookkeeping
+    filters = [tracemalloc.Filter(False, module.__file__) for module in (tracemalloc, cProfile, pstats)]
+    filters.append(tracemalloc.Filter(False, __file__))
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    lines = [f"Top {TOP_ALLOCATIONS} allocation sites by net growth"]
+    lines += [str(entry) for entry in diff[:TOP_ALLOCATIONS]]
+    (run_dir / f"{prefix}.alloc.txt").write_text("\n".join(lines) + "\n")
+
+
+def _collapsed_stacks(stats: pstats.Stats) -> Counter[str]:
+    # cProfile keeps caller->callee edges, not whole stacks, so rebuild paths
+    # from the roots and split each function's own time across its callers
+    # in proportion to the time each edge accounts for. Weights are microseconds.
+    table = stats.stats  # type: ignore[attr-defined]
+    callees: dict[tuple, list[tuple[tuple, float]]] = defaultdict(list)
+    for func, (_, _, _, _, callers) in table.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+
+    stacks: Counter[str] = Counter()
+
+    def walk(func: tuple, path: tuple[str, ...], seen: frozenset, share: float) -> None:
+        _, _, own, total, _ = table[func]
+        frames = (*path, _label(func))
+        weight = round(own * share * 1e6)
+        if weight:
+            stacks[";".join(frames)] += weight
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_total in callees[func]:
+            callee_total = table[callee][3]
+            callee_share = share * edge_total / callee_total if callee_total else 0.0
+            if callee not in seen and callee_share * callee_total >= 1e-6:
+                walk(callee, frames, seen | {callee}, callee_share)
+
+    for func, (_, _, _, _, callers) in table.items():
+        if not callers:
+            walk(func, (), frozenset({func}), 1.0)
+    return stacks
+
+
+def _label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.replace(" ", "_")
+    return f"{name} ({Path(filename).name}:{line})".replace(" ", "_")
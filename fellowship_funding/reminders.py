@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, timedelta
+from pathlib import Path
+
+from .dedup import profile_path
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("data/reminders.json")
+FORMAT_VERSION = 1
+
+# (reminder date as ISO string, window in days, opportunity ID); ISO dates
+# order correctly as strings, so entries round-trip through JSON unchanged
+Entry = tuple[str, int, str]
+
+
+class ReminderIndex:
+    # Min-heap of upcoming reminders for every reported opportunity with a
+    # deadline. A run pops only the entries that have come due, so the cost
+    # follows the reminders sent rather than the size of the history.
+    def __init__(self, heap: list[Entry] | None = None, records: dict[str, dict] | None = None):
+        self.heap = heap or []
+        heapq.heapify(self.heap)
+        # Opportunity ID -> slimmed record, kept while any of its entries is queued
+        self.records = records or {}
+        self._pending = Counter(key for _, _, key in self.heap)
+
+    def schedule(self, opportunities: Iterable[Opportunity], windows: list[int], today: date | None = None) -> int:
+        # Windows already open when an opportunity is first reported are
+        # skipped; the digest it arrived in covers them
+        today = today or date.today()
+        added = 0
+        for opp in opportunities:
+            if opp.deadline is None or opp.id in self.records:
+                continue
+            for window in sorted(set(windows)):
+                remind_at = opp.deadline - timedelta(days=window)
+                if window <= 0 or remind_at <= today:
+                    continue
+                heapq.heappush(self.heap, (remind_at.isoformat(), window, opp.id))
+                self._pending[opp.id] += 1
+                added += 1
+            if self._pending[opp.id]:
+                self.records[opp.id] = _slim(opp)
+        return added
+
+    def pop_due(self, today: date | None = None) -> list[tuple[Opportunity, int]]:
+        # (opportunity, days left) for every reminder due by today, one per
+        # opportunity even if several windows came due across missed runs
+        today = today or date.today()
+        cutoff = today.isoformat()
+        due: set[str] = set()
+        while self.heap and self.heap[0][0] <= cutoff:
+            _, _, key = heapq.heappop(self.heap)
+            self._pending[key] -= 1
+            due.add(key)
+
+        results = []
+        for key in due:
+            record = self.records.get(key)
+            if not self._pending[key]:
+                self.records.pop(key, None)
+                del self._pending[key]
+            if record is None:
+                continue
+            opp = Opportunity.from_dict(record)
+            if opp.deadline and opp.deadline >= today:
+                results.append((opp, (opp.deadline - today).days))
+        results.sort(key=lambda item: (item[1], item[0].title))
+        return results
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+def reminders_path(profile: str = "") -> Path:
+    return profile_path(DEFAULT_PATH, profile)
+
+
+def load_reminders(path: Path = DEFAULT_PATH) -> ReminderIndex | None:
+    # None when no index exists yet, so the caller can seed it
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError):
+        logger.warning("Could not read %s, starting fresh", path)
+        return None
+    if data.get("version") != FORMAT_VERSION:
+        logger.warning("%s has format %r, starting fresh", path, data.get("version"))
+        return None
+    return ReminderIndex([tuple(entry) for entry in data["heap"]], data["records"])
+
+
+def save_reminders(index: ReminderIndex, path: Path = DEFAULT_PATH) -> None:
+    # The list is saved in heap order, so loading it back needs no re-sort
+    data = {"version": FORMAT_VERSION, "heap": index.heap, "records": index.records}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    logger.info("Saved %d pending reminders for %d opportunities", len(index), len(index.records))
+
+
+def _slim(opp: Opportunity) -> dict:
+    # Reminder cards show no excerpt; long text would only bloat the index
+    data = opp.to_dict()
+    data["description"] = ""
+    data["eligibility"] = ""
+    return data
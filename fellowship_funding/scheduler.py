@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+
+from . import corpus
+from .config import Config
+from .dedup import load_seen, seen_path
+from .pipeline import SourceKey, deliver, fetch_one, find_new, profile_opportunities, source_keys, source_kwargs
+from .sources import ALL_SOURCES, REGISTRY, SourceSpec, select
+from .sources.base import Opportunity, Source
+from .sources.health import load_health, save_health
+
+logger = logging.getLogger(__name__)
+
+# Hours between polls per registry name; sources with a watch path are polled
+# only when that file changes
+DEFAULT_CADENCE_HOURS = 168.0
+CADENCE_HOURS = {
+    "zintellect": 24.0,
+    "pathways": 72.0,
+    "ca_grants": 72.0,
+    "uci": 72.0,
+    # Local files; unchanged ones are served from the parse manifest
+    "tabular": 24.0,
+}
+DIGEST_HOURS = 168.0
+TICK_SECONDS = 60.0
+
+
+def parse_cadence(items: list[str]) -> dict[str, float]:
+    # --cadence SOURCE=HOURS, repeatable
+    cadence = {}
+    for item in items:
+        name, sep, hours = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected --cadence SOURCE=HOURS, got {item!r}")
+        if name not in REGISTRY:
+            raise ValueError(f"Unknown source {name!r} in --cadence; expected any of {ALL_SOURCES}")
+        try:
+            value = float(hours)
+        except ValueError:
+            raise ValueError(f"--cadence {name}: hours must be a number, got {hours!r}") from None
+        if not 0 < value < float("inf"):
+            raise ValueError(f"--cadence {name}: hours must be positive, got {hours!r}")
+        cadence[name] = value
+    return cadence
+
+
+class Scheduler:
+    def __init__(
+        self,
+        configs: list[Config],
+        cadence_hours: dict[str, float] | None = None,
+        digest_hours: float = DIGEST_HOURS,
+    ):
+        self.configs = configs
+        self.cadence_hours = {**CADENCE_HOURS, **(cadence_hours or {})}
+        self.digest_interval = digest_hours * 3600
+        self.health = load_health()
+
+        # Source instances and their latest results stay in memory between polls
+        self.units: dict[SourceKey, tuple[SourceSpec, Config]] = {}
+        for config in configs:
+            for spec, key in zip(select(config.sources, config.disabled_sources), source_keys(config)):
+                self.units.setdefault(key, (spec, config))
+        self.sources: dict[SourceKey, Source] = {}
+        self.latest: dict[SourceKey, list[Opportunity]] = {}
+        self.next_fetch: dict[SourceKey, float] = dict.fromkeys(self.units, 0.0)
+        self.watched_mtimes: dict[SourceKey, float] = {}
+
+        # Profile name -> opportunity ID -> (opportunity, score) awaiting the next digest
+        self.pending: dict[str, dict[str, tuple[Opportunity, int]]] = {c.name: {} for c in configs}
+        self.next_digest = time.time() + self.digest_interval
+
+    def run_forever(self, tick_seconds: float = TICK_SECONDS) -> None:
+        logger.info(
+            "Scheduler started: %d source unit(s), %d profile(s), digest every %.0fh",
+            len(self.units), len(self.configs), self.digest_interval / 3600,
+        )
+        try:
+            while True:
+                self.tick()
+                time.sleep(tick_seconds)
+        except KeyboardInterrupt:
+            logger.info("Scheduler stopped")
+
+    def tick(self, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+
+        polled = [key for key in self.units if self._due(key, now)]
+        for key in polled:
+            self._poll(key, now)
+        if polled:
+            save_health(self.health)
+            for config in self.configs:
+                if set(polled) & set(source_keys(config)):
+                    self._accumulate(config)
+
+        if now >= self.next_digest:
+            for config in self.configs:
+                self._send(config)
+            while self.next_digest <= now:
+                self.next_digest += self.digest_interval
+
+    def _due(self, key: SourceKey, now: float) -> bool:
+        spec = self.units[key][0]
+        if spec.watch:
+            path = Path(spec.watch)
+            return path.exists() and path.stat().st_mtime != self.watched_mtimes.get(key)
+        return now >= self.next_fetch[key]
+
+    def _poll(self, key: SourceKey, now: float) -> None:
+        spec, config = self.units[key]
+        if spec.watch:
+            self.watched_mtimes[key] = Path(spec.watch).stat().st_mtime
+        self.next_fetch[key] = now + self.cadence_hours.get(spec.name, DEFAULT_CADENCE_HOURS) * 3600
+
+        source = self.sources.get(key)
+        if source is None:
+            try:
+                source = self.sources[key] = spec.load()(**source_kwargs(spec, config))
+            except Exception:
+                logger.exception("✗ %s: failed to initialize", spec.name)
+                return
+
+        opps = fetch_one(spec, config, self.health, source) or []
+        self.latest[key] = opps
+        try:
+            corpus.upsert(opps)
+        except Exception:
+            logger.exception("Failed to update opportunity corpus")
+
+    def _accumulate(self, config: Config) -> None:
+        pending = self.pending[config.name]
+        for opp, score in find_new(config, profile_opportunities(config, self.latest)):
+            pending[opp.id] = (opp, score)
+        logger.info("[%s] %d opportunities pending for the next digest", config.name or "default", len(pending))
+
+    def _send(self, config: Config) -> None:
+        pending = self.pending[config.name]
+        if not deliver(config, list(pending.values())):
+            return
+        # Whatever the digest budget left out stays pending
+        seen = load_seen(seen_path(config.name))
+        for opp_id in [opp_id for opp_id in pending if opp_id in seen]:
+            del pending[opp_id]
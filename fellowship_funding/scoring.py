@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import heapq
+import logging
 import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import count
 
 from .config import Config
+from .sources import REGISTRY
 from .sources.base import Opportunity
 
+logger = logging.getLogger(__name__)
+
+DISSERTATION_TERMS = [
+    "dissertation", "abd", "candidacy", "completion",
+    "doctoral candidate", "write-up", "thesis",
+]
+
 
 def score_opportunity(opp: Opportunity, config: Config) -> int:
     title_lower = opp.title.lower()
@@ -13,9 +28,7 @@ def score_opportunity(opp: Opportunity, config: Config) -> int:
 
     score = 0.0
 
-    for kw in config.keywords:
-        kw_lower = kw.lower()
-        pattern = re.compile(re.escape(kw_lower))
+    for pattern in _keyword_patterns(tuple(config.keywords)):
         title_hits = len(pattern.findall(title_lower))
         desc_hits = len(pattern.findall(combined))
         score += title_hits * 15 + desc_hits * 5
@@ -29,26 +42,122 @@ def score_opportunity(opp: Opportunity, config: Config) -> int:
 
     # Bonus for dissertation-stage keywords when academic level is dissertation
     if config.academic_level == "dissertation":
-        dissertation_terms = [
-            "dissertation", "abd", "candidacy", "completion",
-            "doctoral candidate", "write-up", "thesis",
-        ]
-        for term in dissertation_terms:
+        for term in DISSERTATION_TERMS:
             if term in combined:
                 score += 10
 
     return min(int(score), 100)
 
 
-def score_and_filter(
-    opportunities: list[Opportunity],
+def iter_scored(
+    opportunities: Iterable[Opportunity],
     config: Config,
-) -> list[tuple[Opportunity, int]]:
-    scored = []
+) -> Iterator[tuple[Opportunity, int]]:
     for opp in opportunities:
         s = score_opportunity(opp, config)
         if s >= config.score_threshold:
-            scored.append((opp, s))
+            yield opp, s
+
 
+def score_and_filter(
+    opportunities: list[Opportunity],
+    config: Config,
+) -> list[tuple[Opportunity, int]]:
+    scored = list(iter_scored(opportunities, config))
     scored.sort(key=lambda x: x[1], reverse=True)
     return scored
+
+
+def select_digest(
+    scored: Iterable[tuple[Opportunity, int]],
+    config: Config,
+    today: date | None = None,
+) -> list[tuple[Opportunity, int]]:
+    horizon = (today or date.today()) + timedelta(days=config.min_deadline_days)
+    limit = config.max_digest or None
+    caps = _source_caps(config)
+
+    # One bounded min-heap per source: nothing outside a source's top
+    # min(cap, limit) can make the digest, so only those entries are kept
+    heaps: dict[str, list[tuple[int, int, Opportunity]]] = {}
+    order = count()
+    total = 0
+    for opp, score in scored:
+        total += 1
+        if config.min_deadline_days and opp.deadline and opp.deadline < horizon:
+            continue
+        bounds = [b for b in (caps.get(opp.source), limit) if b is not None]
+        bound = min(bounds) if bounds else None
+        if bound == 0:
+            continue
+        # Negated arrival order keeps the earlier record on score ties
+        entry = (score, -next(order), opp)
+        heap = heaps.setdefault(opp.source, [])
+        if bound is None or len(heap) < bound:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    survivors = [entry for heap in heaps.values() for entry in heap]
+    top = heapq.nlargest(limit, survivors) if limit else sorted(survivors, reverse=True)
+    if len(top) < total:
+        logger.info("[%s] Digest budget: kept %d of %d opportunities", config.name or "default", len(top), total)
+    return [(opp, score) for score, _, opp in top]
+
+
+def prefilter(
+    opportunities: list[Opportunity],
+    config: Config,
+    today: date | None = None,
+    report: bool = True,
+) -> list[Opportunity]:
+    cutoff = (today or date.today()) - timedelta(days=config.deadline_grace_days)
+    # A record with no term hits scores 0, so it can only pass a positive threshold by accident
+    pattern = _term_pattern(profile_terms(config)) if config.score_threshold > 0 else None
+
+    expired: Counter[str] = Counter()
+    no_signal: Counter[str] = Counter()
+    kept = []
+    for opp in opportunities:
+        if opp.deadline and opp.deadline < cutoff:
+            expired[opp.source] += 1
+            continue
+        if pattern is not None and not pattern.search(
+            f"{opp.title.lower()} {opp.description.lower()} {opp.eligibility.lower()}"
+        ):
+            no_signal[opp.source] += 1
+            continue
+        kept.append(opp)
+
+    # Per-request callers such as the API server pass report=False
+    if report:
+        label = config.name or "default"
+        for source in sorted(expired.keys() | no_signal.keys()):
+            logger.info(
+                "[%s] Pre-filter %s: dropped %d expired, %d without term hits",
+                label, source, expired[source], no_signal[source],
+            )
+    return kept
+
+
+def _source_caps(config: Config) -> dict[str, int]:
+    # Caps are keyed by registry name; records carry the source's display name
+    return {REGISTRY[name].display_name: cap for name, cap in config.source_caps.items()}
+
+
+def profile_terms(config: Config) -> tuple[str, ...]:
+    terms = [kw.lower() for kw in config.keywords]
+    terms.extend(disc.lower() for disc in config.disciplines)
+    if config.academic_level == "dissertation":
+        terms.extend(DISSERTATION_TERMS)
+    return tuple(sorted(set(terms)))
+
+
+@lru_cache(maxsize=32)
+def _keyword_patterns(keywords: tuple[str, ...]) -> tuple[re.Pattern[str], ...]:
+    return tuple(re.compile(re.escape(kw.lower())) for kw in keywords)
+
+
+@lru_cache(maxsize=32)
+def _term_pattern(terms: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(re.escape(term) for term in terms))
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from . import corpus
+from .config import Config, build_config
+from .scoring import iter_scored, prefilter, profile_terms
+from .sources.base import Opportunity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# Minimum seconds between corpus mtime checks
+RELOAD_CHECK_SECONDS = 1.0
+# Words whose matching postings are cached per index
+TERM_CACHE_SIZE = 1024
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class OpportunityIndex:
+    def __init__(self, opportunities: list[Opportunity]):
+        self.by_id: dict[str, Opportunity] = {opp.id: opp for opp in opportunities}
+        self.by_source: dict[str, list[str]] = {}
+        self.postings: dict[str, set[str]] = {}
+        deadlines = []
+        for opp in self.by_id.values():
+            self.by_source.setdefault(opp.source, []).append(opp.id)
+            if opp.deadline:
+                deadlines.append((opp.deadline, opp.id))
+            text = f"{opp.title} {opp.description} {opp.eligibility} {opp.organization}".lower()
+            for token in set(TOKEN_RE.findall(text)):
+                self.postings.setdefault(token, set()).add(opp.id)
+        deadlines.sort()
+        self._deadline_keys = [d for d, _ in deadlines]
+        self._deadline_ids = [opp_id for _, opp_id in deadlines]
+        self._containing: dict[str, frozenset[str]] = {}
+
+    def find(self, query: str = "", source: str = "") -> list[Opportunity]:
+        ids: set[str] | None = None
+        for token in TOKEN_RE.findall(query.lower()):
+            matches = self.postings.get(token, set())
+            ids = matches if ids is None else ids & matches
+        if source:
+            in_source = set(self.by_source.get(source, []))
+            ids = in_source if ids is None else ids & in_source
+        opps = self.by_id.values() if ids is None else (self.by_id[i] for i in ids)
+        return sorted(opps, key=lambda o: (o.deadline or date.max, o.title))
+
+    def candidates(self, config: Config) -> list[Opportunity]:
+        # Records the pre-filter could keep for this profile, in ID order. A
+        # substring match of a term implies a token containing the term's
+        # longest word, so the union over terms is a superset of the matches.
+        terms = profile_terms(config)
+        if config.score_threshold <= 0 or not terms:
+            return list(self.by_id.values())
+        ids: set[str] = set()
+        for term in terms:
+            words = TOKEN_RE.findall(term)
+            if not words:
+                return list(self.by_id.values())
+            ids.update(self._containing_word(max(words, key=len)))
+        return [self.by_id[opp_id] for opp_id in sorted(ids)]
+
+    def _containing_word(self, word: str) -> frozenset[str]:
+        ids = self._containing.get(word)
+        if ids is None:
+            ids = frozenset().union(*(posting for token, posting in self.postings.items() if word in token))
+            if len(self._containing) >= TERM_CACHE_SIZE:
+                self._containing.clear()
+            self._containing[word] = ids
+        return ids
+
+    def upcoming(self, start: date, end: date) -> list[Opportunity]:
+        lo = bisect_left(self._deadline_keys, start)
+        hi = bisect_right(self._deadline_keys, end)
+        return [self.by_id[opp_id] for opp_id in self._deadline_ids[lo:hi]]
+
+
+class IndexHolder:
+    # Rebuilds the index when the corpus file changes and swaps it in atomically,
+    # so in-flight requests keep using the index they started with
+    def __init__(self, path: Path):
+        self.path = path
+        self.index = OpportunityIndex([])
+        self.loaded_mtime: float | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def current(self) -> OpportunityIndex:
+        if time.monotonic() - self._checked_at >= RELOAD_CHECK_SECONDS:
+            self.refresh()
+        return self.index
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            mtime = self.path.stat().st_mtime if self.path.exists() else None
+            if mtime == self.loaded_mtime:
+                return
+            start = time.perf_counter()
+            self.index = OpportunityIndex(corpus.load_all(self.path))
+            self.loaded_mtime = mtime
+            logger.info(
+                "Loaded %d opportunities from %s in %.0f ms",
+                len(self.index.by_id), self.path, (time.perf_counter() - start) * 1000,
+            )
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: ApiServer
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        index = self.server.holder.current()
+        try:
+            if url.path == "/health":
+                self._send({"opportunities": len(index.by_id), "sources": sorted(index.by_source)})
+            elif url.path == "/opportunities":
+                opps = index.find(params.get("q", ""), params.get("source", ""))
+                self._send(_page(opps, params))
+            elif url.path.startswith("/opportunities/"):
+                opp = index.by_id.get(url.path.removeprefix("/opportunities/"))
+                if opp is None:
+                    self._send({"error": "not found"}, HTTPStatus.NOT_FOUND)
+                else:
+                    self._send(opp.to_dict())
+            elif url.path == "/deadlines":
+                start = date.fromisoformat(params["from"]) if "from" in params else date.today()
+                end = start + timedelta(days=int(params.get("days", 30)))
+                self._send(_page(index.upcoming(start, end), params))
+            else:
+                self._send({"error": "not found"}, HTTPStatus.NOT_FOUND)
+        except ValueError as e:
+            self._send({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/score":
+            self._send({"error": "not found"}, HTTPStatus.NOT_FOUND)
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            profile = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(profile, dict):
+                raise ValueError("profile must be a JSON object")
+            config = build_config(profile)
+            index = self.server.holder.current()
+            scored = sorted(
+                iter_scored(prefilter(index.candidates(config), config, report=False), config),
+                key=lambda x: x[1], reverse=True,
+            )
+            page = _page(scored, params)
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+            return
+        page["items"] = [{**opp.to_dict(), "score": score} for opp, score in page["items"]]
+        self._send(page)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, payload: dict, status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], holder: IndexHolder):
+        super().__init__(address, Handler)
+        self.holder = holder
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: Path = corpus.DEFAULT_PATH) -> None:
+    server = ApiServer((host, port), IndexHolder(path))
+    logger.info("Serving opportunity API on http://%s:%d", host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.server_close()
+
+
+def _page(items: list, params: dict[str, str]) -> dict:
+    offset = max(int(params.get("offset", 0)), 0)
+    limit = min(max(int(params.get("limit", DEFAULT_LIMIT)), 0), MAX_LIMIT)
+    page = items[offset:offset + limit]
+    return {
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": [item.to_dict() for item in page] if page and isinstance(page[0], Opportunity) else page,
+    }
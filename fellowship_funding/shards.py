@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .pipeline import SourceKey
+from .sources.base import Opportunity
+from .sources.health import SourceHealth, dump_health, parse_health
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path("data/shards")
+FORMAT_VERSION = 2
+RUN_ID_FORMAT = "%Y%m%d"
+
+
+@dataclass
+class ShardResult:
+    index: int
+    count: int
+    fetched: dict[SourceKey, list[Opportunity]] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    # Health entries for the sources this shard fetched
+    health: dict[str, SourceHealth] = field(default_factory=dict)
+    # Profile name -> opportunity ID -> pre-filtered, unthresholded score
+    scores: dict[str, dict[str, int]] = field(default_factory=dict)
+    # Shared by every shard of one run (--run-id), and the profiles it used
+    run_id: str = ""
+    fingerprint: str = ""
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Expected --shard i/N, got {value!r}") from None
+    if not 0 <= i < n:
+        raise ValueError(f"Shard index must be in [0, {n}), got {i}")
+    return i, n
+
+
+def shard_path(index: int, count: int, directory: Path = DEFAULT_DIR) -> Path:
+    return directory / f"shard-{index}-of-{count}.json.gz"
+
+
+def write_shard(result: ShardResult, path: Path) -> None:
+    data = {
+        "version": FORMAT_VERSION,
+        "run": result.run_id,
+        "fingerprint": result.fingerprint,
+        "index": result.index,
+        "count": result.count,
+        "units": encode_fetched(result.fetched),
+        "skipped": result.skipped,
+        "health": dump_health(result.health),
+        "scores": result.scores,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    tmp.replace(path)
+    logger.info(
+        "Wrote shard %d/%d of run %s to %s: %d source unit(s), %d opportunities",
+        result.index, result.count, result.run_id, path, len(result.fetched),
+        sum(len(opps) for opps in result.fetched.values()),
+    )
+
+
+def read_shard(path: Path) -> ShardResult:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported shard format {data.get('version')!r}")
+    return ShardResult(
+        index=data["index"],
+        count=data["count"],
+        fetched=decode_fetched(data["units"]),
+        skipped=data["skipped"],
+        health=parse_health(data["health"]),
+        scores=data["scores"],
+        run_id=data["run"],
+        fingerprint=data["fingerprint"],
+    )
+
+
+def current_run(results: list[tuple[Path, ShardResult]], fingerprint: str) -> list[tuple[Path, ShardResult]]:
+    # Artifacts from another run, profile set or shard count would mix
+    # layouts, or stand in for a shard that failed this run; only the latest
+    # run for these profiles is merged, one artifact per index
+    matching = [(path, result) for path, result in results if result.fingerprint == fingerprint]
+    if not matching:
+        for path, _ in results:
+            logger.warning("Ignoring %s: written for a different set of profiles", path)
+        return []
+    _, latest = max(matching, key=lambda item: (item[1].run_id, item[0].stat().st_mtime))
+
+    kept: dict[int, tuple[Path, ShardResult]] = {}
+    for path, result in results:
+        if result.fingerprint != fingerprint:
+            reason = "written for a different set of profiles"
+        elif result.run_id != latest.run_id:
+            reason = f"from run {result.run_id}, not {latest.run_id}"
+        elif result.count != latest.count:
+            reason = f"one of {result.count} shards, not {latest.count}"
+        elif result.index in kept:
+            reason = f"duplicate of {kept[result.index][0]}"
+        else:
+            kept[result.index] = (path, result)
+            continue
+        logger.warning("Ignoring %s: %s", path, reason)
+    return [kept[index] for index in sorted(kept)]
+
+
+def encode_fetched(fetched: dict[SourceKey, list[Opportunity]]) -> list[dict]:
+    return [
+        {"source": name, "params": params, "opportunities": [opp.to_dict() for opp in opps]}
+        for (name, params), opps in fetched.items()
+    ]
+
+
+def decode_fetched(units: list[dict]) -> dict[SourceKey, list[Opportunity]]:
+    return {
+        (unit["source"], unit["params"]): [Opportunity.from_dict(opp) for opp in unit["opportunities"]]
+        for unit in units
+    }
@@ -1,17 +1,53 @@
-from .ucla import UCLASource
-from .uci import UCISource
-from .ca_grants import CAGrantsSource
-from .zintellect import ZintellectSource
-from .pathways import PathwaysSource
-from .ucsd import UCSDSource
-from .jhu import JHUSource
-
-ALL_SOURCES = [
-    UCLASource,
-    UCISource,
-    CAGrantsSource,
-    ZintellectSource,
-    PathwaysSource,
-    UCSDSource,
-    JHUSource,
-]
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, field
+
+from .base import Source
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    name: str
+    # "module:ClassName", relative to this package; imported only when the source runs
+    target: str
+    # The class's `name`, which records carry as their source; kept here so
+    # callers can map registry names without importing the module
+    display_name: str
+    # Constructor keyword -> Config field it is filled from
+    params: dict[str, str] = field(default_factory=dict)
+    # Local input file; the scheduler re-polls the source only when it changes
+    watch: str = ""
+
+    def load(self) -> type[Source]:
+        module_name, _, class_name = self.target.partition(":")
+        return getattr(importlib.import_module(module_name, __name__), class_name)
+
+
+REGISTRY: dict[str, SourceSpec] = {spec.name: spec for spec in [
+    SourceSpec("ucla", ".ucla:UCLASource", "UCLA Graduate Funding", {
+        "disciplines": "disciplines",
+        "academic_level": "academic_level",
+    }),
+    SourceSpec("uci", ".uci:UCISource", "UCI Graduate Fellowships", {"academic_level": "academic_level"}),
+    SourceSpec("ca_grants", ".ca_grants:CAGrantsSource", "California Grants Portal"),
+    SourceSpec("zintellect", ".zintellect:ZintellectSource", "Zintellect/ORISE", {
+        "keywords": "keywords",
+        "academic_level": "academic_level",
+        "citizenship": "citizenship",
+    }),
+    SourceSpec("pathways", ".pathways:PathwaysSource", "Pathways to Science", {"keywords": "keywords"}),
+    SourceSpec("ucsd", ".ucsd:UCSDSource", "UCSD Young Investigator"),
+    SourceSpec("jhu", ".jhu:JHUSource", "JHU Early Career Funding", watch="data/jhu_early_career.xlsx"),
+    SourceSpec("tabular", ".tabular:TabularSource", "Institutional Funding Lists"),
+]}
+
+ALL_SOURCES = list(REGISTRY)
+
+
+def select(enabled: list[str] | None = None, disabled: list[str] | None = None) -> list[SourceSpec]:
+    names = ALL_SOURCES if enabled is None else enabled
+    unknown = [n for n in [*names, *(disabled or [])] if n not in REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown source(s) {unknown}; expected any of {ALL_SOURCES}")
+    return [REGISTRY[n] for n in names if n not in (disabled or [])]
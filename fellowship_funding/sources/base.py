@@ -1,8 +1,29 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import date
+from typing import TYPE_CHECKING
+
+from .blobstore import lazy_text
+from .budget import Budget, BudgetExceededError
+from .health import MAX_TIMEOUT, CircuitOpenError, SourceHealth
+
+if TYPE_CHECKING:
+    import requests
+
+_session: requests.Session | None = None
+
+
+def shared_session() -> requests.Session:
+    # One pooled session per process so repeated requests reuse connections
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+    return _session
 
 
 @dataclass
@@ -18,10 +39,62 @@ class Opportunity:
     organization: str
     notes: str = ""
 
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["deadline"] = self.deadline.isoformat() if self.deadline else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Opportunity:
+        deadline = data.get("deadline")
+        return cls(**{**data, "deadline": date.fromisoformat(deadline) if deadline else None})
+
+
+# Long text may live in the run's blob store; see blobstore.activate()
+lazy_text(Opportunity, "description", "eligibility")
+
 
 class Source(ABC):
     name: str
+    # Assigned by the runner; tracks latency and failures across runs
+    health: SourceHealth | None = None
+    # Assigned by the runner when the run has a wall-clock budget
+    budget: Budget | None = None
 
     @abstractmethod
     def fetch(self) -> list[Opportunity]:
         ...
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        session: requests.Session | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        import requests
+
+        health = self.health
+        if health is not None and not health.allow_request():
+            raise CircuitOpenError(f"{self.name}: circuit open, not sending request")
+
+        budget = self.budget
+        timeout = health.timeout() if health is not None else MAX_TIMEOUT
+        if budget is not None:
+            budget.check(self.name)
+            timeout = min(timeout, budget.remaining())
+        start = time.monotonic()
+        try:
+            resp = (session or shared_session()).request(method, url, timeout=timeout, **kwargs)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            # A request cut short by the run budget says nothing about the source
+            if budget is not None and budget.expired():
+                budget.skip(self.name)
+                raise BudgetExceededError(f"{self.name}: run time budget exhausted") from e
+            if health is not None:
+                health.record_failure(time.monotonic() - start)
+            raise
+        if health is not None:
+            health.record_success(time.monotonic() - start)
+        return resp
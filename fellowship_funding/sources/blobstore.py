@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("data/blobs.bin")
+# Shorter text stays inline; a reference costs about as much as a short string
+MIN_BLOB_CHARS = 256
+
+_active: BlobStore | None = None
+
+
+class BlobStoreClosedError(Exception):
+    pass
+
+
+class BlobStore:
+    # Append-only text file for one run; records keep (offset, length)
+    # references and read back through a memory map
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w+b")
+        self._size = 0
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.closed = False
+
+    def put(self, text: str) -> BlobRef:
+        data = text.encode()
+        with self._lock:
+            offset = self._size
+            self._file.write(data)
+            self._size += len(data)
+        return BlobRef(self, offset, len(data))
+
+    def get(self, offset: int, length: int) -> str:
+        if self.closed:
+            raise BlobStoreClosedError(f"Blob store {self.path} is closed; its text can no longer be read")
+        end = offset + length
+        view = self._map
+        if view is None or end > len(view):
+            view = self._remap()
+        return view[offset:end].decode()
+
+    def close(self) -> None:
+        # Records still holding references raise BlobStoreClosedError on access
+        global _active
+        if _active is self:
+            _active = None
+        with self._lock:
+            self.closed = True
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+        logger.info("Blob store %s: %.1f MiB of text kept off-heap", self.path, self._size / 2**20)
+
+    def _remap(self) -> mmap.mmap:
+        # Map everything written so far; growth is amortized because reads
+        # mostly start after fetching has finished. The old map is left to
+        # the garbage collector since another thread may still be reading it.
+        with self._lock:
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            return self._map
+
+
+class BlobRef:
+    __slots__ = ("store", "offset", "length")
+
+    def __init__(self, store: BlobStore, offset: int, length: int):
+        self.store = store
+        self.offset = offset
+        self.length = length
+
+    def load(self) -> str:
+        return self.store.get(self.offset, self.length)
+
+    def __reduce__(self) -> tuple:
+        # Crossing a process boundary, the text travels inline
+        return (str, (self.load(),))
+
+
+class LazyText:
+    # Data descriptor for a long text field. While a store is active, long
+    # values are written to it on assignment and read back on every access,
+    # so only the reference stays resident.
+    def __init__(self, name: str):
+        self.attr = f"_{name}"
+
+    def __get__(self, obj: Any, owner: type | None = None) -> Any:
+        if obj is None:
+            return self
+        value = obj.__dict__[self.attr]
+        return value.load() if type(value) is BlobRef else value
+
+    def __set__(self, obj: Any, value: str) -> None:
+        store = _active
+        if store is not None and len(value) >= MIN_BLOB_CHARS and store._pid == os.getpid() and not store.closed:
+            value = store.put(value)
+        obj.__dict__[self.attr] = value
+
+
+def lazy_text(cls: type, *names: str) -> None:
+    # Installed once the dataclass is built: its generated __init__ assigns
+    # through the descriptors, while the fields themselves stay plain
+    for name in names:
+        setattr(cls, name, LazyText(name))
+
+
+def activate(path: Path = DEFAULT_PATH) -> BlobStore:
+    global _active
+    deactivate()
+    _active = BlobStore(path)
+    logger.info("Long text fields will be stored in %s", path)
+    return _active
+
+
+def deactivate() -> None:
+    # Records already holding references keep working until the store is closed
+    global _active
+    _active = None
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceededError(Exception):
+    pass
+
+
+class Budget:
+    # Run-level wall-clock deadline shared by every source; once it passes,
+    # further requests are refused and the run continues with what it has
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds
+        self.skipped: list[str] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def check(self, name: str) -> None:
+        if self.expired():
+            self.skip(name)
+            raise BudgetExceededError(f"{name}: run time budget exhausted")
+
+    def skip(self, name: str) -> None:
+        with self._lock:
+            if name in self.skipped:
+                return
+            self.skipped.append(name)
+        logger.warning("⏱ %s: skipped, run time budget exhausted", name)
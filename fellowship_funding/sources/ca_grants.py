@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
-
-import requests
+from collections.abc import Iterator
+from datetime import date
 
 from .base import Opportunity, Source
+from .dates import DateParser
+from .jsonstream import stream_items
 
 logger = logging.getLogger(__name__)
 
 CKAN_URL = "https://data.ca.gov/api/3/action/datastore_search_sql"
 RESOURCE_ID = "111c8c88-21f6-453c-ae2c-b4785a0624f5"
 
+_deadlines = DateParser("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
 
 class CAGrantsSource(Source):
     name = "California Grants Portal"
@@ -36,13 +39,8 @@ class CAGrantsSource(Source):
             "ORDER BY \"ApplicationDeadline\" ASC"
         )
 
-        resp = requests.get(CKAN_URL, params={"sql": sql}, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-
-        records = data.get("result", {}).get("records", [])
         results = []
-        for rec in records:
+        for rec in self._iter_records(sql):
             deadline = self._parse_deadline(rec.get("ApplicationDeadline", ""))
             amount_parts = []
             if rec.get("EstAvailFunds"):
@@ -65,13 +63,12 @@ class CAGrantsSource(Source):
         logger.info("CA Grants: fetched %d opportunities", len(results))
         return results
 
+    def _iter_records(self, sql: str) -> Iterator[dict]:
+        with self._request("GET", CKAN_URL, params={"sql": sql}, stream=True) as resp:
+            yield from stream_items(resp, "result", "records")
+
     @staticmethod
     def _parse_deadline(raw: str) -> date | None:
         if not raw:
             return None
-        for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
-            try:
-                return datetime.strptime(raw[:19], fmt).date()
-            except ValueError:
-                continue
-        return None
+        return _deadlines.parse(raw[:19])
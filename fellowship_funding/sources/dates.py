@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, datetime
+
+CACHE_SIZE = 4096
+
+
+class DateParser:
+    # Tries the format that last succeeded first and memoizes raw strings, so a
+    # source's hot loop rarely falls through formats by catching exceptions.
+    # Reordering is only safe for formats that can't both match one string.
+
+    def __init__(self, *formats: str):
+        self.formats = formats
+        self._order = list(formats)
+        self._cache: dict[str, date | None] = {}
+
+    def parse(self, raw: str) -> date | None:
+        if not raw:
+            return None
+        try:
+            return self._cache[raw]
+        except KeyError:
+            pass
+
+        result = None
+        for fmt in self._order:
+            result = parse_format(raw, fmt)
+            if result is not None:
+                if fmt != self._order[0]:
+                    self._order = [fmt] + [f for f in self._order if f != fmt]
+                break
+
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[raw] = result
+        return result
+
+
+def parse_format(raw: str, fmt: str) -> date | None:
+    fast = FAST_PATHS.get(fmt)
+    if fast is not None:
+        result = fast(raw)
+        if result is not None:
+            return result
+    if not _plausible(raw, fmt):
+        return None
+    try:
+        return datetime.strptime(raw, fmt).date()
+    except ValueError:
+        return None
+
+
+def _iso_date(raw: str) -> date | None:
+    if len(raw) != 10 or raw[4] != "-" or raw[7] != "-":
+        return None
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def _iso_datetime(raw: str) -> date | None:
+    if len(raw) != 19 or raw[10] != "T":
+        return None
+    try:
+        return datetime.fromisoformat(raw).date()
+    except ValueError:
+        return None
+
+
+def _iso_datetime_z(raw: str) -> date | None:
+    if len(raw) != 20 or raw[19] != "Z":
+        return None
+    return _iso_datetime(raw[:19])
+
+
+def _compact(raw: str) -> date | None:
+    if len(raw) != 8 or not (raw.isascii() and raw.isdigit()):
+        return None
+    return _ymd(raw[:4], raw[4:6], raw[6:])
+
+
+def _month_first(sep: str) -> Callable[[str], date | None]:
+    def parse(raw: str) -> date | None:
+        parts = raw.split(sep)
+        if len(parts) != 3:
+            return None
+        month, day, year = parts
+        if not (1 <= len(month) <= 2 and 1 <= len(day) <= 2 and len(year) == 4):
+            return None
+        if not (raw.isascii() and (month + day + year).isdigit()):
+            return None
+        return _ymd(year, month, day)
+    return parse
+
+
+def _ymd(year: str, month: str, day: str) -> date | None:
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _plausible(raw: str, fmt: str) -> bool:
+    # Cheap shape checks that only reject strings strptime would also reject
+    for char in fmt.replace("%%", ""):
+        if char in "/-:," and char not in raw:
+            return False
+    if fmt.startswith("%Y"):
+        return raw[:4].isdigit()
+    if fmt.startswith("%m"):
+        return raw[:1].isdigit()
+    if fmt.startswith("%B"):
+        return raw[:1].isalpha()
+    return True
+
+
+FAST_PATHS: dict[str, Callable[[str], date | None]] = {
+    "%Y-%m-%d": _iso_date,
+    "%Y-%m-%dT%H:%M:%S": _iso_datetime,
+    "%Y-%m-%dT%H:%M:%SZ": _iso_datetime_z,
+    "%Y%m%d": _compact,
+    "%m/%d/%Y": _month_first("/"),
+    "%m-%d-%Y": _month_first("-"),
+}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("data/health.json")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+MAX_TIMEOUT = 30.0
+MIN_TIMEOUT = 5.0
+# Per-request deadline is this multiple of the observed p99 latency
+TIMEOUT_FACTOR = 3.0
+MIN_SAMPLES = 5
+LATENCY_WINDOW = 50
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 6 * 3600
+# Weight of the latest run in the new-matches-per-second moving average
+YIELD_SMOOTHING = 0.3
+# Floor on fetch time so a near-instant fetch can't dominate the ordering
+MIN_FETCH_SECONDS = 1.0
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+@dataclass
+class SourceHealth:
+    name: str
+    state: str = CLOSED
+    failure_streak: int = 0
+    opened_at: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    # Wall-clock seconds of the last completed fetch
+    fetch_seconds: float = 0.0
+    # New matches per second of fetch time; None until first measured
+    yield_rate: float | None = None
+    probing: bool = field(default=False, repr=False)
+
+    def timeout(self) -> float:
+        if len(self.latencies) < MIN_SAMPLES:
+            return MAX_TIMEOUT
+        ordered = sorted(self.latencies)
+        p99 = ordered[math.ceil(0.99 * len(ordered)) - 1]
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p99 * TIMEOUT_FACTOR))
+
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.time() - self.opened_at < COOLDOWN_SECONDS
+
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if self.is_open():
+                return False
+            self._transition(HALF_OPEN)
+        # Half-open: let exactly one probe through until it resolves
+        if self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def record_success(self, latency: float) -> None:
+        self._record_latency(latency)
+        self.failure_streak = 0
+        self.probing = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self, latency: float) -> None:
+        # Timeouts count at their full duration so p99 can't shrink below them
+        self._record_latency(latency)
+        self.failure_streak += 1
+        self.probing = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failure_streak >= FAILURE_THRESHOLD):
+            self.opened_at = time.time()
+            self._transition(OPEN)
+
+    def record_yield(self, new_matches: int) -> None:
+        rate = new_matches / max(self.fetch_seconds, MIN_FETCH_SECONDS)
+        if self.yield_rate is None:
+            self.yield_rate = rate
+        else:
+            self.yield_rate = YIELD_SMOOTHING * rate + (1 - YIELD_SMOOTHING) * self.yield_rate
+        self.yield_rate = round(self.yield_rate, 4)
+
+    def _record_latency(self, latency: float) -> None:
+        self.latencies.append(round(latency, 3))
+        del self.latencies[:-LATENCY_WINDOW]
+
+    def _transition(self, state: str) -> None:
+        logger.warning(
+            "Circuit %s: %s -> %s (failure streak %d, timeout %.1fs)",
+            self.name, self.state, state, self.failure_streak, self.timeout(),
+        )
+        self.state = state
+
+
+def load_health(path: Path = DEFAULT_PATH) -> dict[str, SourceHealth]:
+    if not path.exists():
+        return {}
+    try:
+        return parse_health(json.loads(path.read_text()))
+    except (json.JSONDecodeError, OSError, TypeError, AttributeError):
+        logger.warning("Could not read %s, starting fresh", path)
+        return {}
+
+
+def save_health(health: dict[str, SourceHealth], path: Path = DEFAULT_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dump_health(health), indent=2) + "\n")
+
+
+def parse_health(data: dict) -> dict[str, SourceHealth]:
+    return {name: SourceHealth(name=name, **{k: v for k, v in entry.items() if k != "name"})
+            for name, entry in data.items()}
+
+
+def dump_health(health: dict[str, SourceHealth]) -> dict[str, dict]:
+    data = {}
+    for name, entry in sorted(health.items()):
+        record = asdict(entry)
+        del record["name"], record["probing"]
+        data[name] = record
+    return data
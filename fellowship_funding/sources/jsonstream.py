@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+_decoder = json.JSONDecoder()
+
+
+def stream_items(resp: requests.Response, *path: str, meta: dict[str, Any] | None = None) -> Iterator[Any]:
+    yield from iter_items(resp.iter_content(CHUNK_SIZE), *path, meta=meta)
+
+
+def iter_items(chunks: Iterable[bytes], *path: str, meta: dict[str, Any] | None = None) -> Iterator[Any]:
+    # Walk object keys down `path`, then yield the target array's items one at a
+    # time; only the current item and one chunk of text are held in memory.
+    # Sibling values of the array (such as a total count) are collected into
+    # `meta` when given, including those after the array once it is exhausted.
+    reader = _Reader(chunks)
+    for depth, key in enumerate(path):
+        siblings = meta if depth == len(path) - 1 else None
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                return
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            value = reader.value()
+            if siblings is not None:
+                siblings[name] = value
+            if reader.peek() == ",":
+                reader.pos += 1
+
+    yield from _array(reader)
+    if meta is not None and path:
+        while reader.peek() == ",":
+            reader.pos += 1
+            name = reader.value()
+            reader.expect(":")
+            meta[name] = reader.value()
+
+
+def _array(reader: _Reader) -> Iterator[Any]:
+    if reader.peek() == "n" and reader.value() is None:
+        return
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, got {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number that ends the buffer may continue in the next chunk,
+            # and one cut at "1." or "1e" decodes as just its leading digits
+            if (end == len(self.buf) or self.buf[end] in NUMBER_CHARS) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self._decode(b"", final=True)
+        else:
+            text = self._decode(chunk)
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Payloads smaller than this parse inline; pickling and IPC would cost more
+INLINE_THRESHOLD = 64 * 1024
+
+T = TypeVar("T")
+
+_workers = 0
+_executor: ProcessPoolExecutor | None = None
+
+
+def configure(workers: int) -> None:
+    global _workers
+    shutdown()
+    _workers = max(workers, 0)
+    if _workers:
+        logger.info("HTML parsing offloaded to up to %d worker processes", _workers)
+
+
+def submit(fn: Callable[..., T], payload: Any, *args: Any, size: int | None = None) -> Future[T]:
+    global _executor
+    if size is None:
+        size = len(payload)
+    if _workers and size >= INLINE_THRESHOLD:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_workers)
+        return _executor.submit(fn, payload, *args)
+
+    future: Future[T] = Future()
+    try:
+        future.set_result(fn(payload, *args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        # Work queued by fetches the run budget abandoned is not waited on
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
@@ -3,12 +3,14 @@ from __future__ import annotations
 import logging
 import re
 import time
+from concurrent.futures import Future
 from datetime import date, datetime
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
+from . import parsepool
 from .base import Opportunity, Source
+from .query import QueryCapabilities, plan_queries
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +18,14 @@ BASE_URL = "https://www.pathwaystoscience.org"
 SEARCH_URL = f"{BASE_URL}/programs.aspx"
 DELAY = 1.5
 
+# (program id, title, url, description, institution)
+Record = tuple[str, str, str, str, str]
+
 
 class PathwaysSource(Source):
     name = "Pathways to Science"
+    # The "ft" free-text field takes a single phrase, no boolean operators
+    query_capabilities = QueryCapabilities(supports_or=False)
 
     def __init__(self, keywords: list[str] | None = None):
         self.keywords = keywords or []
@@ -37,74 +44,85 @@ class PathwaysSource(Source):
         queries: list[dict[str, str]] = [
             {"u": "GradPhDs_Graduate Students (PhD)", "p": "YesPortable"},
         ]
-        for kw in self.keywords[:3]:
-            queries.append({
-                "u": "GradPhDs_Graduate Students (PhD)",
-                "ft": kw,
-            })
-
-        for params in queries:
+        for term in plan_queries(self.keywords, self.query_capabilities):
+            if term:
+                queries.append({
+                    "u": "GradPhDs_Graduate Students (PhD)",
+                    "ft": term,
+                })
+
+        # Pages parse (possibly in worker processes) while later queries download
+        pages: list[Future[list[Record]]] = []
+        for i, params in enumerate(queries):
+            if i:
+                time.sleep(DELAY)
             params.update({"adv": "adv", "submit": "y"})
-            opps = self._search(params)
-            for opp in opps:
+            pages.append(self._search(params))
+
+        for page in pages:
+            for record in page.result():
+                opp = self._to_opportunity(record)
                 if opp.id not in seen_ids:
                     seen_ids.add(opp.id)
                     results.append(opp)
-            time.sleep(DELAY)
 
         logger.info("Pathways: fetched %d unique opportunities", len(results))
         return results
 
-    def _search(self, params: dict) -> list[Opportunity]:
-        resp = requests.get(SEARCH_URL, params=params, timeout=30)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        return self._parse_results(soup)
-
-    def _parse_results(self, soup: BeautifulSoup) -> list[Opportunity]:
-        results = []
-        divs = soup.select("div.progigert")
-
-        current_institution = ""
-        for div in divs:
-            # Header divs contain h2 with institution name
-            h2 = div.find("h2")
-            if h2:
-                current_institution = h2.get_text(strip=True)
-                continue
-
-            # Content divs contain program links
-            link = div.find("a", href=lambda h: h and "programhub" in h)
-            if not link:
-                continue
-
-            href = link.get("href", "")
-            if not href.startswith("http"):
-                href = f"{BASE_URL}/{href.lstrip('/')}"
-
-            match = re.search(r"sort=(.+?)(?:&|$)", href)
-            prog_id = match.group(1) if match else href
-
-            title = link.get_text(strip=True)
-            if title == "...read more":
-                continue
-
-            # Description is in a child div
-            desc_div = div.find("div")
-            description = desc_div.get_text(strip=True) if desc_div else ""
-            # Remove the "...read more" suffix
-            description = re.sub(r"\s*\.\.\.read more\s*$", "", description)
-
-            results.append(Opportunity(
-                id=f"pathways:{prog_id}",
-                title=title,
-                url=href,
-                source=self.name,
-                description=description,
-                deadline=None,
-                amount="",
-                eligibility="PhD Students",
-                organization=current_institution,
-            ))
-
-        return results
+    def _search(self, params: dict) -> Future[list[Record]]:
+        resp = self._request("GET", SEARCH_URL, params=params)
+        return parsepool.submit(parse_results, resp.content, resp.encoding)
+
+    def _to_opportunity(self, record: Record) -> Opportunity:
+        prog_id, title, href, description, institution = record
+        return Opportunity(
+            id=f"pathways:{prog_id}",
+            title=title,
+            url=href,
+            source=self.name,
+            description=description,
+            deadline=None,
+            amount="",
+            eligibility="PhD Students",
+            organization=institution,
+        )
+
+
+def parse_results(html: bytes, encoding: str | None = None) -> list[Record]:
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+    results = []
+    divs = soup.select("div.progigert")
+
+    current_institution = ""
+    for div in divs:
+        # Header divs contain h2 with institution name
+        h2 = div.find("h2")
+        if h2:
+            current_institution = h2.get_text(strip=True)
+            continue
+
+        # Content divs contain program links
+        link = div.find("a", href=lambda h: h and "programhub" in h)
+        if not link:
+            continue
+
+        href = link.get("href", "")
+        if not href.startswith("http"):
+            href = f"{BASE_URL}/{href.lstrip('/')}"
+
+        match = re.search(r"sort=(.+?)(?:&|$)", href)
+        prog_id = match.group(1) if match else href
+
+        title = link.get_text(strip=True)
+        if title == "...read more":
+            continue
+
+        # Description is in a child div
+        desc_div = div.find("div")
+        description = desc_div.get_text(strip=True) if desc_div else ""
+        # Remove the "...read more" suffix
+        description = re.sub(r"\s*\.\.\.read more\s*$", "", description)
+
+        results.append((prog_id, title, href, description, current_institution))
+
+    return results
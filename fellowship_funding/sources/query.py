@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryCapabilities:
+    # Server accepts `a OR b` in a single search
+    supports_or: bool = False
+    or_operator: str = " OR "
+    # Longest query string the server handles; 0 means no known limit
+    max_query_length: int = 0
+    # Searches match anywhere in the text rather than whole keyword/tag values,
+    # so a phrase's results are contained in those of any keyword inside it
+    full_text: bool = True
+
+
+def plan_queries(keywords: list[str], capabilities: QueryCapabilities) -> list[str]:
+    # Cover every profile keyword in as few server-side searches as the source allows
+    terms = _dedupe(keywords)
+    if not terms:
+        return [""]
+    if capabilities.full_text:
+        terms = _drop_subsumed(terms)
+    if not capabilities.supports_or:
+        return terms
+
+    # First-fit decreasing: longest terms first, each into the first query with room
+    queries: list[list[str]] = []
+    lengths: list[int] = []
+    sep = len(capabilities.or_operator)
+    limit = capabilities.max_query_length
+    for term in sorted((_quote(t) for t in terms), key=len, reverse=True):
+        for i, length in enumerate(lengths):
+            if not limit or length + sep + len(term) <= limit:
+                queries[i].append(term)
+                lengths[i] += sep + len(term)
+                break
+        else:
+            if limit and len(term) > limit:
+                logger.warning("Keyword %r exceeds the %d-character query limit; sending it alone", term, limit)
+            queries.append([term])
+            lengths.append(len(term))
+
+    planned = [capabilities.or_operator.join(q) for q in queries]
+    logger.debug("Planned %d quer%s for %d keyword(s)", len(planned), "y" if len(planned) == 1 else "ies", len(terms))
+    return planned
+
+
+def _dedupe(keywords: list[str]) -> list[str]:
+    seen: set[str] = set()
+    terms = []
+    for keyword in keywords:
+        term = " ".join(keyword.split())
+        if term and term.lower() not in seen:
+            seen.add(term.lower())
+            terms.append(term)
+    return terms
+
+
+def _drop_subsumed(terms: list[str]) -> list[str]:
+    # "nutrition science" adds nothing to a search that already covers "nutrition"
+    words = [set(t.lower().split()) for t in terms]
+    return [
+        term for i, term in enumerate(terms)
+        if not any(j != i and words[j] < words[i] for j in range(len(terms)))
+    ]
+
+
+def _quote(term: str) -> str:
+    return f'"{term}"' if " " in term else term
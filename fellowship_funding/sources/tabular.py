@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import re
+from concurrent.futures import Future
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from . import parsepool
+from .base import Opportunity, Source
+from .dates import DateParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path("data/tabular")
+MAPPINGS_FILE = "mappings.json"
+MANIFEST_PATH = Path("data/tabular-manifest.json.gz")
+MANIFEST_VERSION = 1
+SUFFIXES = (".xlsx", ".xlsm", ".csv")
+
+# Header names tried in order for each field (lowercased); the first
+# non-empty cell among them wins, row by row
+COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "title": ("opportunity", "title", "name"),
+    "deadline": ("deadline", "due date"),
+    "url": ("url", "link", "website"),
+    "description": ("description", "subject", "subject matter"),
+    "amount": ("amount", "funding", "award amount"),
+    "eligibility": ("eligibility", "requirements"),
+    "organization": ("organization", "funder", "sponsor"),
+}
+
+# Field -> value; deadline is an ISO date string so rows can be cached as JSON
+Row = dict[str, str | None]
+
+_dates = DateParser("%m/%d/%Y", "%Y-%m-%d", "%B %d, %Y", "%m-%d-%Y")
+
+
+class TabularSource(Source):
+    name = "Institutional Funding Lists"
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory or DEFAULT_DIR
+
+    def fetch(self) -> list[Opportunity]:
+        if not self.directory.is_dir():
+            logger.info("Tabular: no directory at %s, skipping", self.directory)
+            return []
+
+        try:
+            return self._fetch()
+        except Exception:
+            logger.exception("Failed to fetch from %s", self.name)
+            return []
+
+    def _fetch(self) -> list[Opportunity]:
+        mappings = _load_mappings(self.directory / MAPPINGS_FILE)
+        manifest = _load_manifest(MANIFEST_PATH)
+        files = sorted(p for p in self.directory.iterdir() if p.suffix.lower() in SUFFIXES)
+
+        # Unchanged files come from the manifest; the rest parse in parallel
+        pending: dict[str, tuple[dict, Future[list[Row]]]] = {}
+        entries: dict[str, dict] = {}
+        for path in files:
+            mapping = mappings.get(path.name, {})
+            columns = mapping.get("columns", {})
+            stat = path.stat()
+            entry = manifest.get(path.name)
+            mapping_key = json.dumps(columns, sort_keys=True)
+            if entry and entry["mapping"] == mapping_key and entry["mtime"] == stat.st_mtime:
+                entries[path.name] = entry
+                continue
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry["mapping"] == mapping_key and entry["sha256"] == digest:
+                entries[path.name] = {**entry, "mtime": stat.st_mtime}
+                continue
+            entry = {"mtime": stat.st_mtime, "sha256": digest, "mapping": mapping_key}
+            pending[path.name] = (entry, parsepool.submit(parse_table, data, path.suffix.lower(), columns))
+
+        for name, (entry, future) in pending.items():
+            try:
+                entries[name] = {**entry, "rows": future.result()}
+            except Exception:
+                logger.exception("Tabular: failed to parse %s", name)
+        logger.info(
+            "Tabular: %d file(s), %d parsed, %d unchanged",
+            len(files), len(pending), len(files) - len(pending),
+        )
+        _save_manifest(entries, MANIFEST_PATH)
+
+        results = []
+        for path in files:
+            if path.name not in entries:
+                continue
+            mapping = mappings.get(path.name, {})
+            # Records keep the registry's display name as their source so
+            # per-source caps and skip notices match; the file's own label
+            # stands in for rows that name no organization
+            label = mapping.get("source") or path.stem.replace("_", " ")
+            for row in entries[path.name]["rows"]:
+                results.append(to_opportunity(
+                    row, f"tabular:{_slug(path.stem)}", self.name, mapping.get("default_url", ""), label,
+                ))
+        logger.info("Tabular: %d opportunities", len(results))
+        return results
+
+
+def parse_table(data: bytes, suffix: str, columns: dict[str, str] | None = None) -> list[Row]:
+    # Runs in a worker process for large files
+    rows = _xlsx_rows(data) if suffix in (".xlsx", ".xlsm") else _csv_rows(data)
+    return map_rows(rows, columns or {})
+
+
+def map_rows(rows: Any, columns: dict[str, str]) -> list[Row]:
+    # `columns` maps a field to the exact header to use instead of the aliases
+    rows = iter(rows)
+    header = next(rows, None)
+    if not header:
+        return []
+    col_idx: dict[str, int] = {}
+    for i, h in enumerate(header):
+        name = str(h).strip().lower() if h else ""
+        if name and name not in col_idx:
+            col_idx[name] = i
+    candidates = {
+        field: [col_idx[a] for a in ((columns[field].strip().lower(),) if field in columns else aliases)
+                if a in col_idx]
+        for field, aliases in COLUMN_ALIASES.items()
+    }
+
+    results = []
+    for row in rows:
+        def cell(i: int) -> Any:
+            return row[i] if i < len(row) else None
+
+        def get(field: str) -> str:
+            for i in candidates[field]:
+                val = cell(i)
+                if val:
+                    return str(val).strip()
+            return ""
+
+        title = get("title")
+        if not title:
+            continue
+        deadline = None
+        for i in candidates["deadline"]:
+            deadline = _to_date(cell(i))
+            if deadline:
+                break
+
+        results.append({
+            "title": title,
+            "deadline": deadline.isoformat() if deadline else None,
+            **{field: get(field) for field in ("url", "description", "amount", "eligibility", "organization")},
+        })
+    return results
+
+
+def to_opportunity(
+    row: Row, id_prefix: str, source: str, default_url: str = "", organization: str = "",
+) -> Opportunity:
+    # IDs hash the title so they are stable across runs and processes
+    digest = hashlib.sha1((row["title"] or "").encode()).hexdigest()[:12]
+    return Opportunity(
+        id=f"{id_prefix}:{digest}",
+        title=row["title"] or "",
+        url=row["url"] or default_url,
+        source=source,
+        description=row["description"] or "",
+        deadline=date.fromisoformat(row["deadline"]) if row["deadline"] else None,
+        amount=row["amount"] or "",
+        eligibility=row["eligibility"] or "",
+        organization=row["organization"] or organization,
+    )
+
+
+def _to_date(val: Any) -> date | None:
+    if isinstance(val, datetime):
+        return val.date()
+    if isinstance(val, date):
+        return val
+    if val:
+        return _dates.parse(str(val).strip())
+    return None
+
+
+def _xlsx_rows(data: bytes) -> list[tuple]:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        return list(ws.iter_rows(values_only=True)) if ws is not None else []
+    finally:
+        wb.close()
+
+
+def _csv_rows(data: bytes) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(data.decode("utf-8-sig", errors="replace"))))
+
+
+def _load_mappings(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError):
+        logger.warning("Could not read %s, using default column aliases", path)
+        return {}
+
+
+def _load_manifest(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, EOFError, json.JSONDecodeError):
+        logger.warning("Could not read %s, re-parsing all files", path)
+        return {}
+    return data.get("files", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+
+def _save_manifest(entries: dict[str, dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": entries}, f, separators=(",", ":"))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
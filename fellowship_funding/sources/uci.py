@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
+from collections.abc import Iterator
+from concurrent.futures import Future
+from datetime import date
 
-import requests
 from bs4 import BeautifulSoup
 
+from . import parsepool
 from .base import Opportunity, Source
+from .dates import DateParser
+from .jsonstream import stream_items
 
 logger = logging.getLogger(__name__)
 
 WP_API_URL = "https://grad.uci.edu/wp-json/wp/v2/fellowships"
 ANNOUNCEMENTS_URL = "https://grad.uci.edu/funding/fellowship-announcements/"
 
+# (title, url, description)
+Announcement = tuple[str, str, str]
+
+_deadlines = DateParser("%Y%m%d")
+
 
 UCI_LEVEL_MAP = {
     "dissertation": {"current", "advanced"},
@@ -28,24 +37,20 @@ class UCISource(Source):
 
     def fetch(self) -> list[Opportunity]:
         try:
-            results = self._fetch_api()
-            results.extend(self._fetch_announcements())
+            # API text extraction runs (possibly in a worker) while announcements download
+            api_results, api_texts = self._fetch_api()
+            announcements = self._fetch_announcements()
+            results = self._finish_api(api_results, api_texts)
+            results.extend(self._finish_announcements(announcements))
             return results
         except Exception:
             logger.exception("Failed to fetch from %s", self.name)
             return []
 
-    def _fetch_api(self) -> list[Opportunity]:
-        resp = requests.get(
-            WP_API_URL,
-            params={"per_page": 100},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
+    def _fetch_api(self) -> tuple[list[Opportunity], Future[list[str]]]:
         results = []
-        for item in data:
+        fragments: list[str] = []
+        for item in self._iter_fellowships():
             acf = item.get("acf", {})
             if acf.get("application_status") != "open":
                 continue
@@ -54,43 +59,44 @@ class UCISource(Source):
                 continue
 
             deadline = self._parse_deadline(acf.get("deadline", ""))
-            desc = BeautifulSoup(
-                item.get("content", {}).get("rendered", ""),
-                "html.parser",
-            ).get_text(strip=True)
+            fragments.append(item.get("content", {}).get("rendered", ""))
+            fragments.append(acf.get("eligibility_criteria", ""))
 
             results.append(Opportunity(
                 id=f"uci:{item['id']}",
                 title=item.get("title", {}).get("rendered", ""),
                 url=item.get("link", ""),
                 source=self.name,
-                description=desc,
+                description="",
                 deadline=deadline,
                 amount=acf.get("amount", ""),
-                eligibility=BeautifulSoup(
-                    acf.get("eligibility_criteria", ""), "html.parser"
-                ).get_text(strip=True),
+                eligibility="",
                 organization="UC Irvine Graduate Division",
             ))
 
+        texts = parsepool.submit(html_to_text, fragments, size=sum(len(f) for f in fragments))
+        return results, texts
+
+    def _finish_api(self, results: list[Opportunity], texts: Future[list[str]]) -> list[Opportunity]:
+        plain = texts.result()
+        for i, opp in enumerate(results):
+            opp.description = plain[2 * i]
+            opp.eligibility = plain[2 * i + 1]
+
         logger.info("UCI API: fetched %d open fellowships", len(results))
         return results
 
-    def _fetch_announcements(self) -> list[Opportunity]:
-        resp = requests.get(ANNOUNCEMENTS_URL, timeout=30)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        results = []
-        for link in soup.select("article a[href]"):
-            title = link.get_text(strip=True)
-            href = link.get("href", "")
-            if not title or not href:
-                continue
+    def _iter_fellowships(self) -> Iterator[dict]:
+        with self._request("GET", WP_API_URL, params={"per_page": 100}, stream=True) as resp:
+            yield from stream_items(resp)
 
-            parent = link.find_parent("article")
-            desc = parent.get_text(strip=True) if parent else ""
+    def _fetch_announcements(self) -> Future[list[Announcement]]:
+        resp = self._request("GET", ANNOUNCEMENTS_URL)
+        return parsepool.submit(parse_announcements, resp.content, resp.encoding)
 
+    def _finish_announcements(self, announcements: Future[list[Announcement]]) -> list[Opportunity]:
+        results = []
+        for title, href, desc in announcements.result():
             opp_id = href.rstrip("/").rsplit("/", 1)[-1]
             results.append(Opportunity(
                 id=f"uci-announce:{opp_id}",
@@ -109,9 +115,25 @@ class UCISource(Source):
 
     @staticmethod
     def _parse_deadline(raw: str) -> date | None:
-        if not raw:
-            return None
-        try:
-            return datetime.strptime(raw, "%Y%m%d").date()
-        except ValueError:
-            return None
+        return _deadlines.parse(raw)
+
+
+def html_to_text(fragments: list[str]) -> list[str]:
+    return [BeautifulSoup(f, "html.parser").get_text(strip=True) for f in fragments]
+
+
+def parse_announcements(html: bytes, encoding: str | None = None) -> list[Announcement]:
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+
+    results = []
+    for link in soup.select("article a[href]"):
+        title = link.get_text(strip=True)
+        href = link.get("href", "")
+        if not title or not href:
+            continue
+
+        parent = link.find_parent("article")
+        desc = parent.get_text(strip=True) if parent else ""
+        results.append((title, href, desc))
+
+    return results
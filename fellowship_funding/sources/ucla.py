@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
-
-import requests
+from collections.abc import Iterator
+from datetime import date
 
 from .base import Opportunity, Source
+from .dates import DateParser
+from .jsonstream import stream_items
 
 logger = logging.getLogger(__name__)
 
 SOLR_URL = "https://grad.ucla.edu/se/grapes_main/select"
 STALE_CUTOFF_YEARS = 4
 
+_updated_dates = DateParser("%m/%d/%Y")
+_deadlines = DateParser("%m/%d/%Y", "%Y-%m-%dT%H:%M:%SZ")
+
 DISCIPLINE_FIELDS = {
     "public health": "publichealth",
     "social sciences": "socialsciences",
@@ -45,27 +49,13 @@ class UCLASource(Source):
             fq_parts.append("doctoraldiss:true")
         fq = " OR ".join(fq_parts)
 
-        resp = requests.get(
-            SOLR_URL,
-            params={
-                "q": "*:*",
-                "wt": "json",
-                "indent": "true",
-                "fq": fq,
-                "rows": 500,
-            },
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
         today = date.today()
         cutoff_year = today.year - STALE_CUTOFF_YEARS
 
         results = []
         skipped = 0
-        for doc in data.get("response", {}).get("docs", []):
-            updated = self._parse_date(doc.get("updated", ""), "%m/%d/%Y")
+        for doc in self._iter_docs(fq):
+            updated = _updated_dates.parse(doc.get("updated", ""))
 
             # Filter out records not updated within the cutoff
             if updated and updated.year < cutoff_year:
@@ -100,17 +90,22 @@ class UCLASource(Source):
         logger.info("UCLA: fetched %d opportunities (%d stale filtered out)", len(results), skipped)
         return results
 
+    def _iter_docs(self, fq: str) -> Iterator[dict]:
+        with self._request(
+            "GET",
+            SOLR_URL,
+            params={
+                "q": "*:*",
+                "wt": "json",
+                "fq": fq,
+                "rows": 500,
+            },
+            stream=True,
+        ) as resp:
+            yield from stream_items(resp, "response", "docs")
+
     @staticmethod
     def _parse_deadline(raw: str) -> date | None:
         if not raw or "2075" in raw:
             return None
-        return UCLASource._parse_date(raw, "%m/%d/%Y") or UCLASource._parse_date(raw, "%Y-%m-%dT%H:%M:%SZ")
-
-    @staticmethod
-    def _parse_date(raw: str, fmt: str) -> date | None:
-        if not raw:
-            return None
-        try:
-            return datetime.strptime(raw, fmt).date()
-        except ValueError:
-            return None
+        return _deadlines.parse(raw)
@@ -29,8 +29,7 @@ class UCSDSource(Source):
         session = requests.Session()
 
         # Step 1: Get embed page and extract data URL
-        resp = session.get(f"{EMBED_URL}?viewControls=on", timeout=30)
-        resp.raise_for_status()
+        resp = self._request("GET", f"{EMBED_URL}?viewControls=on", session=session)
 
         # Extract urlWithParams directly — the prefetch object uses JS syntax (unquoted keys)
         url_match = re.search(
@@ -51,16 +50,16 @@ class UCSDSource(Source):
             data_url = f"https://airtable.com{data_url}"
 
         # Step 2: Fetch actual data
-        resp2 = session.get(
+        resp2 = self._request(
+            "GET",
             data_url,
+            session=session,
             headers={
                 "x-airtable-application-id": APP_ID,
                 "X-Requested-With": "XMLHttpRequest",
                 "x-time-zone": "America/Los_Angeles",
             },
-            timeout=30,
         )
-        resp2.raise_for_status()
         data = resp2.json()
 
         return self._parse_records(data)
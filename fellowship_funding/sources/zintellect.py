@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
-
-import requests
+import math
+from collections.abc import Iterator
+from datetime import date
 
 from .base import Opportunity, Source
+from .dates import DateParser
+from .jsonstream import stream_items
+from .query import QueryCapabilities, plan_queries
 
 logger = logging.getLogger(__name__)
 
 SEARCH_URL = "https://zintellect.com/Catalog/Index_DataTableResult"
 DETAIL_URL = "https://zintellect.com/Opportunity/Details"
+PAGE_SIZE = 200
+# Page cap for one query when the response doesn't report its total
+MAX_PAGES = 25
+
+_dates = DateParser("%m-%d-%Y")
 
 ACADEMIC_LEVELS = {
     "phd_student": 1006145,
@@ -28,6 +36,8 @@ CITIZENSHIP_MAP = {
 
 class ZintellectSource(Source):
     name = "Zintellect/ORISE"
+    # The catalog keyword box is an Elasticsearch query string
+    query_capabilities = QueryCapabilities(supports_or=True, max_query_length=256)
 
     def __init__(
         self,
@@ -50,23 +60,40 @@ class ZintellectSource(Source):
         seen_ids: set[int] = set()
         results: list[Opportunity] = []
 
-        search_terms = self.keywords[:4] if self.keywords else [""]
-
-        for term in search_terms:
-            opps = self._search(term)
-            for opp in opps:
-                if opp["id"] not in seen_ids:
-                    seen_ids.add(opp["id"])
-                    results.append(self._to_opportunity(opp))
+        for query in plan_queries(self.keywords, self.query_capabilities):
+            # OR-packed queries can match more than one page. Stop at the
+            # reported total, or at a page with nothing new in case the
+            # endpoint ignores `start`.
+            query_ids: set[int] = set()
+            max_pages = MAX_PAGES
+            page = 0
+            while page < max_pages:
+                meta: dict = {}
+                count = 0
+                known = len(query_ids)
+                for opp in self._search(query, page * PAGE_SIZE, meta):
+                    count += 1
+                    query_ids.add(opp["id"])
+                    if opp["id"] not in seen_ids:
+                        seen_ids.add(opp["id"])
+                        results.append(self._to_opportunity(opp))
+                total = meta.get("recordsTotal")
+                if type(total) is int:
+                    max_pages = min(math.ceil(total / PAGE_SIZE), MAX_PAGES)
+                if count < PAGE_SIZE or len(query_ids) == known:
+                    break
+                page += 1
+            if page >= MAX_PAGES:
+                logger.warning("Zintellect: stopped %r after %d pages", query, MAX_PAGES)
 
         logger.info("Zintellect: fetched %d unique opportunities", len(results))
         return results
 
-    def _search(self, keyword: str) -> list[dict]:
+    def _search(self, keyword: str, start: int = 0, meta: dict | None = None) -> Iterator[dict]:
         payload = {
             "draw": 1,
-            "start": 0,
-            "length": 200,
+            "start": start,
+            "length": PAGE_SIZE,
             "Keyword": keyword,
             "AcademicLevels": ACADEMIC_LEVELS.get(self.academic_level, 1006145),
             "Citizenship": CITIZENSHIP_MAP.get(self.citizenship, 3),
@@ -74,17 +101,17 @@ class ZintellectSource(Source):
             "IsCatalogSortedByElasticSearchScore": "true" if keyword else "false",
         }
 
-        resp = requests.post(
+        with self._request(
+            "POST",
             SEARCH_URL,
             data=payload,
             headers={
                 "X-Requested-With": "XMLHttpRequest",
                 "Accept": "application/json",
             },
-            timeout=30,
-        )
-        resp.raise_for_status()
-        return resp.json().get("data", [])
+            stream=True,
+        ) as resp:
+            yield from stream_items(resp, "data", meta=meta)
 
     def _to_opportunity(self, item: dict) -> Opportunity:
         ref_code = item.get("referenceCode", "")
@@ -104,9 +131,4 @@ class ZintellectSource(Source):
 
     @staticmethod
     def _parse_date(raw: str) -> date | None:
-        if not raw:
-            return None
-        try:
-            return datetime.strptime(raw, "%m-%d-%Y").date()
-        except ValueError:
-            return None
+        return _dates.parse(raw)
@@ -0,0 +1,73 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from fellowship_funding.sources import blobstore
+from fellowship_funding.sources.base import Opportunity
+from fellowship_funding.sources.blobstore import BlobRef, BlobStoreClosedError
+
+LONG = "Long description. " * 40
+
+
+def _opp(description: str = LONG, eligibility: str = "") -> Opportunity:
+    return Opportunity(
+        id="test:1", title="Fellowship", url="", source="Test", description=description,
+        deadline=None, amount="", eligibility=eligibility, organization="",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = blobstore.activate(tmp_path / "blobs.bin")
+    yield store
+    blobstore.deactivate()
+    if not store.closed:
+        store.close()
+
+
+def test_fields_have_no_default():
+    fields = {f.name: f for f in dataclasses.fields(Opportunity)}
+    assert fields["description"].default is dataclasses.MISSING
+    assert fields["eligibility"].default is dataclasses.MISSING
+    with pytest.raises(TypeError):
+        Opportunity(id="x", title="", url="", source="", deadline=None, amount="", organization="")
+
+
+def test_without_store_text_stays_inline():
+    opp = _opp()
+    assert opp.__dict__["_description"] == LONG
+    assert opp.description == LONG
+
+
+def test_long_text_goes_to_store(store):
+    opp = _opp(eligibility="short")
+    assert type(opp.__dict__["_description"]) is BlobRef
+    assert opp.__dict__["_eligibility"] == "short"
+    assert opp.description == LONG
+    assert opp.to_dict()["description"] == LONG
+    assert opp == _opp(eligibility="short")
+
+
+def test_many_records_read_back(store):
+    opps = [_opp(description=f"{i} " + LONG) for i in range(200)]
+    assert all(opp.description == f"{i} " + LONG for i, opp in enumerate(opps))
+
+
+def test_references_pickle_as_text(store):
+    restored = pickle.loads(pickle.dumps(_opp()))
+    assert restored.__dict__["_description"] == LONG
+
+
+def test_reading_after_close_raises_clear_error(store):
+    opp = _opp()
+    store.close()
+    with pytest.raises(BlobStoreClosedError):
+        opp.description
+
+
+def test_close_deactivates_store(store):
+    store.close()
+    opp = _opp()
+    assert opp.__dict__["_description"] == LONG
+    assert opp.description == LONG
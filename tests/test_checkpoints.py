@@ -0,0 +1,99 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fellowship_funding import checkpoints, main
+from fellowship_funding.checkpoints import FETCHED, KEEP_DAYS, SCORED, SENT, Checkpoint
+from fellowship_funding.config import Config
+from fellowship_funding.sources.base import Opportunity
+
+BEFORE_MIDNIGHT = datetime(2026, 10, 18, 23, 59, tzinfo=timezone.utc)
+AFTER_MIDNIGHT = datetime(2026, 10, 19, 0, 30, tzinfo=timezone.utc)
+
+
+def test_resume_after_midnight(tmp_path):
+    first = Checkpoint([Config()], now=BEFORE_MIDNIGHT, root=tmp_path)
+    first.save(FETCHED, {"units": []})
+    resumed = Checkpoint([Config()], resume=True, now=AFTER_MIDNIGHT, root=tmp_path)
+    assert resumed.dir == first.dir
+    assert resumed.load(FETCHED) == {"units": []}
+
+
+def test_without_resume_starts_a_new_run(tmp_path):
+    Checkpoint([Config()], now=BEFORE_MIDNIGHT, root=tmp_path).save(FETCHED, {})
+    fresh = Checkpoint([Config()], now=AFTER_MIDNIGHT, root=tmp_path)
+    assert fresh.run_id == AFTER_MIDNIGHT.strftime(checkpoints.RUN_ID_FORMAT)
+    assert fresh.load(FETCHED) is None
+
+
+def test_resume_picks_latest_incomplete_run_for_same_profiles(tmp_path):
+    Checkpoint([Config()], now=BEFORE_MIDNIGHT - timedelta(hours=2), root=tmp_path).save(FETCHED, "older")
+    Checkpoint([Config()], now=BEFORE_MIDNIGHT, root=tmp_path).save(FETCHED, "latest")
+    Checkpoint([Config(keywords=["other"])], now=AFTER_MIDNIGHT, root=tmp_path).save(FETCHED, "other profiles")
+    resumed = Checkpoint([Config()], resume=True, now=AFTER_MIDNIGHT, root=tmp_path)
+    assert resumed.load(FETCHED) == "latest"
+
+
+def test_resume_ignores_runs_older_than_keep_days(tmp_path):
+    Checkpoint([Config()], now=BEFORE_MIDNIGHT, root=tmp_path).save(FETCHED, "stale")
+    later = BEFORE_MIDNIGHT + timedelta(days=KEEP_DAYS + 1)
+    resumed = Checkpoint([Config()], resume=True, now=later, root=tmp_path)
+    assert resumed.run_id == later.strftime(checkpoints.RUN_ID_FORMAT)
+    assert resumed.load(FETCHED) is None
+
+
+def test_load_rejects_checkpoint_from_another_run(tmp_path):
+    checkpoint = Checkpoint([Config()], resume=True, now=AFTER_MIDNIGHT, root=tmp_path)
+    checkpoint.save(SENT, True, "a")
+    path = checkpoint._path(SENT, "a")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"version": checkpoints.FORMAT_VERSION, "run": "elsewhere", "stage": SENT, "data": True}, f)
+    assert checkpoint.load(SENT, "a") is None
+
+
+def test_clear_and_prune(tmp_path):
+    old = Checkpoint([Config()], now=datetime.now(timezone.utc) - timedelta(days=KEEP_DAYS + 1), root=tmp_path)
+    old.save(FETCHED, {})
+    legacy = tmp_path / "2026-01-01-abcdef012345"
+    legacy.mkdir()
+    current = Checkpoint([Config()], root=tmp_path)
+    current.save(FETCHED, {})
+    current.prune()
+    assert not old.dir.exists() and not legacy.exists()
+    assert current.dir.exists()
+    current.clear()
+    assert not current.dir.exists()
+
+
+def test_fingerprint_ignores_credentials():
+    assert checkpoints.fingerprint([Config()]) == checkpoints.fingerprint([Config(gmail_refresh_token="secret")])
+    assert checkpoints.fingerprint([Config()]) != checkpoints.fingerprint([Config(score_threshold=20)])
+
+
+def test_resumed_run_re_emits_ndjson(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = Config(keywords=["nutrition"], sources=["ucla"])
+    opp = Opportunity(
+        id="ucla:1", title="Nutrition fellowship", url="", source="UCLA Graduate Funding",
+        description="nutrition", deadline=None, amount="", eligibility="", organization="",
+    )
+    fetched = {("ucla", json.dumps({"academic_level": "dissertation", "disciplines": config.disciplines},
+                                   sort_keys=True)): [opp]}
+    outputs = {"email", "ndjson"}
+
+    monkeypatch.setattr(main, "deliver", lambda *args: False)
+    with pytest.raises(SystemExit):
+        main.report([config], fetched, [], {}, Checkpoint([config]), outputs=outputs, ndjson_path="first/out.ndjson")
+
+    monkeypatch.setattr(main, "deliver", lambda *args: True)
+    resumed = Checkpoint([config], resume=True)
+    assert resumed.load(SCORED, config.name) is not None
+    main.report([config], fetched, [], {}, resumed, outputs=outputs, ndjson_path="second/out.ndjson")
+
+    def lines(directory: str) -> list[dict]:
+        return [json.loads(line) for path in (tmp_path / directory).glob("*.gz") for line in gzip.open(path, "rt")]
+
+    assert [row["id"] for row in lines("first")] == ["ucla:1"]
+    assert lines("second") == lines("first")
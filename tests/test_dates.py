@@ -0,0 +1,62 @@
+from datetime import date, datetime
+
+import pytest
+
+from fellowship_funding.sources import dates
+from fellowship_funding.sources.dates import FAST_PATHS, DateParser, parse_format
+
+SAMPLES = [
+    "2026-03-05", "2026-3-5", "2026-03-05T10:20:30", "2026-03-05T10:20:30Z", "20260305",
+    "03/05/2026", "3/5/2026", "03-05-2026", "3-5-2026", "02/30/2026", "13/01/2026", "2026-02-30",
+    "March 5, 2026", "Mar 5, 2026", "05/03/26", "0003/05/2026", "3/5/20260", " 3/5/2026",
+    "2026-03-05 ", "+3/5/2026", "3/+5/2026", "２０２６-03-05", "x",
+]
+FORMATS = [*FAST_PATHS, "%B %d, %Y", "%b %d, %Y", "%Y/%m/%d", "%d %B %Y"]
+
+
+def _strptime(raw: str, fmt: str) -> date | None:
+    try:
+        return datetime.strptime(raw, fmt).date()
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_parse_format_agrees_with_strptime(fmt):
+    for raw in SAMPLES:
+        assert parse_format(raw, fmt) == _strptime(raw, fmt), raw
+
+
+def test_tries_formats_in_order():
+    parser = DateParser("%m/%d/%Y", "%Y-%m-%d", "%B %d, %Y")
+    assert parser.parse("03/05/2026") == date(2026, 3, 5)
+    assert parser.parse("2026-03-06") == date(2026, 3, 6)
+    assert parser.parse("March 7, 2026") == date(2026, 3, 7)
+    assert parser.parse("not a date") is None
+    assert parser.parse("") is None
+
+
+def test_last_successful_format_moves_first():
+    parser = DateParser("%m/%d/%Y", "%Y-%m-%d")
+    parser.parse("2026-03-05")
+    assert parser._order == ["%Y-%m-%d", "%m/%d/%Y"]
+    assert parser.formats == ("%m/%d/%Y", "%Y-%m-%d")
+    assert parser.parse("03/05/2026") == date(2026, 3, 5)
+    assert parser._order == ["%m/%d/%Y", "%Y-%m-%d"]
+
+
+def test_results_are_memoized(monkeypatch):
+    parser = DateParser("%Y-%m-%d")
+    assert parser.parse("2026-03-05") == date(2026, 3, 5)
+    assert parser.parse("bogus") is None
+    monkeypatch.setattr(dates, "parse_format", lambda raw, fmt: pytest.fail("cache miss"))
+    assert parser.parse("2026-03-05") == date(2026, 3, 5)
+    assert parser.parse("bogus") is None
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(dates, "CACHE_SIZE", 3)
+    parser = DateParser("%Y-%m-%d")
+    for day in range(1, 8):
+        parser.parse(f"2026-03-{day:02d}")
+        assert len(parser._cache) <= 3
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from fellowship_funding import email
+from fellowship_funding.sources.base import Opportunity
+
+
+@pytest.fixture(autouse=True)
+def cards(monkeypatch):
+    cache = OrderedDict()
+    monkeypatch.setattr(email, "_cards", cache)
+    return cache
+
+
+def _opp(**kwargs) -> Opportunity:
+    fields = dict(
+        id="ucla:1", title="Dissertation <fellowship>", url="https://example.org/?a=1&b=2",
+        source="UCLA Graduate Funding", description="x" * 500, deadline=date(2026, 12, 1),
+        amount="$5,000", eligibility="", organization="Graduate Division",
+    )
+    return Opportunity(**{**fields, **kwargs})
+
+
+def test_repeated_card_hits_cache(cards):
+    first = email._card(_opp(), 10)
+    assert email._card(_opp(), 10) is first
+    assert len(cards) == 1
+    assert "Dissertation &lt;fellowship&gt;" in first and "a=1&amp;b=2" in first
+
+
+def test_text_past_the_excerpt_shares_the_card(cards):
+    first = email._card(_opp(), 10)
+    assert email._card(_opp(description="x" * 600), 10) is first
+    assert len(cards) == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"title": "Other"}, {"url": "https://example.org/2"}, {"deadline": None}, {"amount": ""},
+    {"organization": "Other"}, {"notes": "Deadline changed"}, {"description": "short"},
+])
+def test_changed_field_misses_cache(cards, change):
+    first = email._card(_opp(), 10)
+    second = email._card(replace(_opp(), **change), 10)
+    assert second != first
+    assert len(cards) == 2
+
+
+def test_score_is_part_of_the_key(cards):
+    assert "Score: 10" in email._card(_opp(), 10)
+    assert "Score: 20" in email._card(_opp(), 20)
+    assert len(cards) == 2
+
+
+def test_cache_keeps_most_recently_used(cards, monkeypatch):
+    monkeypatch.setattr(email, "CARD_CACHE_SIZE", 2)
+    a, b, c = (_opp(title=title) for title in "abc")
+    email._card(a, 1)
+    email._card(b, 1)
+    email._card(a, 1)
+    email._card(c, 1)
+    assert len(cards) == 2
+    assert all("b</a>" not in html for html in cards.values())
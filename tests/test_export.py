@@ -0,0 +1,85 @@
+import gzip
+import json
+from datetime import date
+
+import pytest
+
+from fellowship_funding import checkpoints, main
+from fellowship_funding.config import Config
+from fellowship_funding.export import NdjsonSink, parse_outputs, to_line
+from fellowship_funding.pipeline import source_keys
+from fellowship_funding.sources.base import Opportunity
+
+
+def _opp(id: str, **kwargs) -> Opportunity:
+    fields = dict(
+        id=id, title="Beca de nutrición", url="https://example.org", source="UCLA Graduate Funding",
+        description="nutrition", deadline=date(2026, 12, 1), amount="", eligibility="", organization="",
+    )
+    return Opportunity(**{**fields, **kwargs})
+
+
+def _read_parts(paths) -> list[dict]:
+    return [json.loads(line) for path in paths for line in gzip.open(path, "rt", encoding="utf-8")]
+
+
+def test_line_matches_record():
+    opp = _opp("ucla:1", deadline=None)
+    line = to_line(opp, 42, "alice")
+    assert line.endswith("}\n") and "nutrición" in line
+    assert json.loads(line) == {"profile": "alice", "score": 42, **opp.to_dict()}
+    assert json.loads(to_line(_opp("ucla:2"), 1))["deadline"] == "2026-12-01"
+
+
+def test_parse_outputs():
+    assert parse_outputs("email, ndjson") == {"email", "ndjson"}
+    for value in ("", "email,csv"):
+        with pytest.raises(ValueError):
+            parse_outputs(value)
+
+
+def test_stdout_target(capsys):
+    with NdjsonSink() as sink:
+        sink.write(_opp("ucla:1"), 10, "a")
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["ucla:1"]
+    assert sink.parts == []
+
+
+def test_tap_passes_records_through_while_writing(tmp_path):
+    scored = [(_opp(f"ucla:{i}"), i) for i in range(3)]
+    with NdjsonSink(str(tmp_path / "out.ndjson")) as sink:
+        tapped = sink.tap(iter(scored), "a")
+        # Nothing is written until the pipeline pulls records through
+        assert sink.lines == 0
+        passed = list(tapped)
+    assert passed == scored
+    assert all(a is b for (a, _), (b, _) in zip(passed, scored))
+    assert [(row["id"], row["score"], row["profile"]) for row in _read_parts(sink.parts)] == [
+        ("ucla:0", 0, "a"), ("ucla:1", 1, "a"), ("ucla:2", 2, "a"),
+    ]
+
+
+def test_parts_rotate_by_size(tmp_path):
+    line_size = len(to_line(_opp("ucla:0"), 0))
+    with NdjsonSink(str(tmp_path / "exports/out.ndjson.gz"), max_bytes=2 * line_size) as sink:
+        for i in range(5):
+            sink.write(_opp(f"ucla:{i}"), i)
+    assert len(sink.parts) == 3
+    assert all(path.parent == tmp_path / "exports" and path.name.startswith("out-") for path in sink.parts)
+    assert [path.name.endswith(f"-{i:03d}.ndjson.gz") for i, path in enumerate(sink.parts)] == [True] * 3
+    assert [row["id"] for row in _read_parts(sink.parts)] == [f"ucla:{i}" for i in range(5)]
+    assert sink.lines == 5
+
+
+def test_ndjson_only_leaves_seen_state_alone(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "deliver", lambda *args: pytest.fail("deliver called without email output"))
+    config = Config(keywords=["nutrition"], sources=["ucla"])
+    fetched = {key: [_opp("ucla:1", title="Nutrition fellowship")] for key in source_keys(config)}
+    main.report([config], fetched, [], {}, checkpoints.Checkpoint([config]),
+                outputs={"ndjson"}, ndjson_path=str(tmp_path / "out.ndjson"))
+    assert [row["id"] for row in _read_parts(tmp_path.glob("out-*.ndjson.gz"))] == ["ucla:1"]
+    assert not list((tmp_path / "data").glob("seen*.json"))
+    assert not list((tmp_path / "data").glob("signatures*.json"))
+    assert not list((tmp_path / "data").glob("reminders*.json"))
@@ -0,0 +1,115 @@
+from fellowship_funding.sources import health as health_mod
+from fellowship_funding.sources.health import (
+    CLOSED,
+    COOLDOWN_SECONDS,
+    FAILURE_THRESHOLD,
+    HALF_OPEN,
+    LATENCY_WINDOW,
+    MAX_TIMEOUT,
+    MIN_SAMPLES,
+    MIN_TIMEOUT,
+    OPEN,
+    SourceHealth,
+)
+
+
+def _opened() -> SourceHealth:
+    h = SourceHealth("test")
+    for _ in range(FAILURE_THRESHOLD):
+        h.record_failure(1.0)
+    return h
+
+
+def _cooled() -> SourceHealth:
+    h = _opened()
+    h.opened_at -= COOLDOWN_SECONDS + 1
+    return h
+
+
+def test_opens_after_failure_threshold():
+    h = SourceHealth("test")
+    for _ in range(FAILURE_THRESHOLD - 1):
+        h.record_failure(1.0)
+    assert h.state == CLOSED and h.allow_request()
+    h.record_failure(1.0)
+    assert h.state == OPEN
+    assert h.is_open()
+    assert not h.allow_request()
+
+
+def test_success_resets_failure_streak():
+    h = SourceHealth("test")
+    for _ in range(FAILURE_THRESHOLD - 1):
+        h.record_failure(1.0)
+    h.record_success(0.5)
+    h.record_failure(1.0)
+    assert h.state == CLOSED
+    assert h.failure_streak == 1
+
+
+def test_half_open_lets_one_probe_through():
+    h = _cooled()
+    assert not h.is_open()
+    assert h.allow_request()
+    assert h.state == HALF_OPEN
+    assert not h.allow_request()
+
+
+def test_probe_success_closes():
+    h = _cooled()
+    h.allow_request()
+    h.record_success(0.5)
+    assert h.state == CLOSED
+    assert h.failure_streak == 0
+    assert h.allow_request() and h.allow_request()
+
+
+def test_probe_failure_reopens_with_new_cooldown():
+    h = _cooled()
+    h.allow_request()
+    h.record_failure(1.0)
+    assert h.state == OPEN
+    assert h.is_open()
+    assert not h.allow_request()
+
+
+def test_timeout_defaults_until_enough_samples():
+    h = SourceHealth("test")
+    for _ in range(MIN_SAMPLES - 1):
+        h.record_success(0.1)
+    assert h.timeout() == MAX_TIMEOUT
+    h.record_success(0.1)
+    assert h.timeout() == MIN_TIMEOUT
+
+
+def test_timeout_follows_p99():
+    h = SourceHealth("test", latencies=[2.0] * 98 + [4.0, 4.0])
+    assert h.timeout() == 12.0
+    h.latencies = [20.0] * MIN_SAMPLES
+    assert h.timeout() == MAX_TIMEOUT
+
+
+def test_latency_window_is_bounded():
+    h = SourceHealth("test")
+    for i in range(LATENCY_WINDOW + 10):
+        h.record_success(float(i))
+    assert len(h.latencies) == LATENCY_WINDOW
+    assert h.latencies[0] == 10.0
+
+
+def test_record_yield_smooths():
+    h = SourceHealth("test", fetch_seconds=10.0)
+    h.record_yield(5)
+    assert h.yield_rate == 0.5
+    h.record_yield(0)
+    assert h.yield_rate == round((1 - health_mod.YIELD_SMOOTHING) * 0.5, 4)
+
+
+def test_dump_and_parse_round_trip():
+    h = _opened()
+    h.probing = True
+    restored = health_mod.parse_health(health_mod.dump_health({"test": h}))["test"]
+    assert restored.state == OPEN
+    assert restored.failure_streak == FAILURE_THRESHOLD
+    assert restored.latencies == h.latencies
+    assert restored.probing is False
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from fellowship_funding.sources.jsonstream import iter_items
+
+DOC = json.dumps({
+    "draw": 1,
+    "meta": {"skip": [1, {"data": "not this one"}], "n": -12.5e-3},
+    "data": [{"id": 1, "title": "Fellowship, \"quoted\" ]"}, -0.25, 12345, 1.5e10, True, None, "é✓", [], {}],
+    "recordsTotal": 9,
+}, ensure_ascii=False).encode()
+EXPECTED = json.loads(DOC)["data"]
+
+
+@pytest.mark.parametrize("split", range(1, len(DOC)))
+def test_any_two_chunk_split(split):
+    assert list(iter_items([DOC[:split], DOC[split:]], "data")) == EXPECTED
+
+
+def test_one_byte_chunks():
+    assert list(iter_items([DOC[i:i + 1] for i in range(len(DOC))], "data")) == EXPECTED
+
+
+def test_nested_path():
+    doc = b'{"result": {"records": [{"a": 1}, {"a": 2}]}}'
+    assert list(iter_items([doc], "result", "records")) == [{"a": 1}, {"a": 2}]
+
+
+def test_missing_key_yields_nothing():
+    assert list(iter_items([b'{"other": [1, 2]}'], "data")) == []
+
+
+def test_null_and_empty_arrays():
+    assert list(iter_items([b'{"data": null}'], "data")) == []
+    assert list(iter_items([b'{"data": [ ]}'], "data")) == []
+
+
+def test_truncated_stream_raises():
+    with pytest.raises(ValueError):
+        list(iter_items([b'{"data": [1, 2'], "data"))
+
+
+def test_bad_separator_raises():
+    with pytest.raises(ValueError):
+        list(iter_items([b'{"data": [1 2]}'], "data"))
+
+
+@pytest.mark.parametrize("split", range(1, len(DOC), 7))
+def test_meta_collects_sibling_values(split):
+    meta = {}
+    assert list(iter_items([DOC[:split], DOC[split:]], "data", meta=meta)) == EXPECTED
+    assert meta == {"draw": 1, "meta": {"skip": [1, {"data": "not this one"}], "n": -12.5e-3}, "recordsTotal": 9}
+
+
+def test_meta_after_empty_array():
+    meta = {}
+    assert list(iter_items([b'{"data": [], "recordsTotal": 0}'], "data", meta=meta)) == []
+    assert meta == {"recordsTotal": 0}
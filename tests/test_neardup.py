@@ -0,0 +1,69 @@
+from datetime import date
+
+from fellowship_funding import neardup
+from fellowship_funding.sources.base import Opportunity
+
+
+def _opp(id: str, title: str, deadline: date | None = None, organization: str = "", url: str = "", **kwargs) -> Opportunity:
+    return Opportunity(
+        id=id, title=title, url=url or f"https://example.org/{id}", source=kwargs.pop("source", "Test"),
+        description=kwargs.pop("description", ""), deadline=deadline, amount="", eligibility="",
+        organization=organization, **kwargs,
+    )
+
+
+def test_collapse_keeps_highest_scoring_member():
+    a = _opp("a:1", "Ford Foundation Predoctoral Fellowship", date(2026, 12, 1), "Ford Foundation",
+             url="https://a.example.org/ford", description="longer description than b")
+    b = _opp("b:1", "Ford Foundation Predoctoral Fellowship", date(2026, 12, 1), "Ford Foundation",
+             url="https://b.example.org/ford")
+    assert neardup.collapse([(a, 20), (b, 40)]) == [(b, 40)]
+
+
+def test_collapse_keeps_records_with_different_deadlines():
+    scored = [
+        (_opp(f"jhu:{i}", f"Early Career Award {i}", date(2027, 1, i), url="https://research.jhu.edu/list/"), 30)
+        for i in range(1, 6)
+    ]
+    assert neardup.collapse(scored) == scored
+
+
+def test_collapse_needs_deadline_or_organization_evidence():
+    a = _opp("a:1", "Dissertation Completion Fellowship", url="https://grad.ucla.edu/funding/")
+    b = _opp("b:1", "Dissertation Completion Fellowship", url="https://grad.ucla.edu/funding/")
+    assert len(neardup.collapse([(a, 10), (b, 10)])) == 2
+
+
+def test_shingles_include_url_query_and_fragment():
+    ucla = _opp("ucla:1", "Fellowship", url="https://grad.ucla.edu/funding/#/view-record/4711/0")
+    pathways = _opp("pathways:1", "Fellowship", url="https://www.pathwaystoscience.org/programs.aspx?u=4712")
+    assert "url:4711" in neardup.shingles(ucla)
+    assert "url:4712" in neardup.shingles(pathways)
+
+
+def test_corroborated():
+    assert neardup.corroborated(("2026-12-01", ""), ("2026-12-01", ""))
+    assert neardup.corroborated(("", "nsf"), ("2026-12-01", "nsf"))
+    assert not neardup.corroborated(("2026-12-01", "nsf"), ("2026-12-02", "nsf"))
+    assert not neardup.corroborated(("", ""), ("", ""))
+
+
+def test_filter_history_requires_evidence(tmp_path):
+    sent = _opp("a:1", "Ford Foundation Dissertation Fellowship", date(2026, 12, 1), "Ford Foundation")
+    path = tmp_path / "signatures.json"
+    neardup.save_history(neardup.record_history([(sent, 50)], {}), path)
+    history = neardup.load_history(path)
+
+    repost = _opp("b:9", "Ford Foundation Dissertation Fellowship", date(2026, 12, 1), "Ford Foundation",
+                  url=sent.url)
+    next_cycle = _opp("b:10", "Ford Foundation Dissertation Fellowship", date(2027, 12, 1), "Ford Foundation",
+                      url=sent.url)
+    assert list(neardup.filter_history([(repost, 50), (next_cycle, 50)], history)) == [(next_cycle, 50)]
+
+
+def test_filter_history_ignores_entries_without_evidence():
+    sent = _opp("a:1", "Ford Foundation Dissertation Fellowship", date(2026, 12, 1), "Ford Foundation")
+    history = {"a:1": ("2026-10-01", neardup.signature(sent), ("", ""))}
+    repost = _opp("b:9", "Ford Foundation Dissertation Fellowship", date(2026, 12, 1), "Ford Foundation",
+                  url=sent.url)
+    assert list(neardup.filter_history([(repost, 50)], history)) == [(repost, 50)]
@@ -0,0 +1,57 @@
+import pytest
+
+from fellowship_funding.sources import parsepool, tabular
+from fellowship_funding.sources.tabular import TabularSource, parse_table
+from fellowship_funding.sources.uci import html_to_text
+
+ROWS = "Title,Deadline,Amount\n" + "".join(f"Award {i},12/{i % 28 + 1:02d}/2026,${i}\n" for i in range(3000))
+FRAGMENTS = [f"<p>Fellowship <b>{i}</b> &amp; stipend</p>" for i in range(50)]
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    # Even small payloads go to the pool
+    monkeypatch.setattr(parsepool, "INLINE_THRESHOLD", 0)
+    parsepool.configure(2)
+    yield
+    parsepool.configure(0)
+
+
+def _inline(fn, *args):
+    parsepool.configure(0)
+    return parsepool.submit(fn, *args).result()
+
+
+def test_worker_results_match_inline(workers):
+    expected_rows = _inline(parse_table, ROWS.encode(), ".csv")
+    expected_text = _inline(html_to_text, FRAGMENTS)
+    parsepool.configure(2)
+    assert parsepool.submit(parse_table, ROWS.encode(), ".csv").result() == expected_rows
+    assert parsepool.submit(html_to_text, FRAGMENTS).result() == expected_text
+    assert parsepool._executor is not None
+    parsepool.shutdown()
+    assert parsepool._executor is None
+
+
+def test_worker_exception_reaches_caller(workers):
+    future = parsepool.submit(parse_table, b"not a workbook", ".xlsx")
+    with pytest.raises(Exception) as worker_error:
+        future.result()
+    parsepool.configure(0)
+    with pytest.raises(type(worker_error.value)):
+        parsepool.submit(parse_table, b"not a workbook", ".xlsx").result()
+
+
+def test_tabular_source_same_with_and_without_workers(tmp_path, monkeypatch, workers):
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / "data/tabular"
+    directory.mkdir(parents=True)
+    (directory / "awards.csv").write_text(ROWS)
+    (directory / "broken.xlsx").write_bytes(b"not a workbook")
+
+    pooled = TabularSource().fetch()
+    tabular.MANIFEST_PATH.unlink()
+    parsepool.configure(0)
+    inline = TabularSource().fetch()
+    assert len(pooled) == 3000
+    assert [opp.to_dict() for opp in pooled] == [opp.to_dict() for opp in inline]
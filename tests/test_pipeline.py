@@ -0,0 +1,79 @@
+import threading
+
+from fellowship_funding import email, pipeline
+from fellowship_funding.config import Config
+from fellowship_funding.sources import REGISTRY, SourceSpec
+from fellowship_funding.sources.base import Opportunity, Source
+from fellowship_funding.sources.budget import Budget
+from fellowship_funding.sources.health import SourceHealth
+
+SPEC = SourceSpec("fake", "fake:FakeSource", "Fake Source")
+
+
+class HangingSource(Source):
+    name = "Fake Source"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.done = threading.Event()
+
+    def fetch(self) -> list[Opportunity]:
+        self.release.wait(5)
+        self.health.record_failure(30.0)
+        self.done.set()
+        return []
+
+
+class QuickSource(Source):
+    name = "Fake Source"
+
+    def fetch(self) -> list[Opportunity]:
+        self.health.record_success(0.25)
+        return []
+
+
+def test_abandoned_fetch_leaves_shared_health_alone():
+    health = {"fake": SourceHealth("fake")}
+    source = HangingSource()
+    budget = Budget(0.05)
+    assert pipeline.fetch_one(SPEC, Config(), health, source, budget) is None
+    assert budget.skipped == ["Fake Source"]
+
+    source.release.set()
+    assert source.done.wait(5)
+    assert health["fake"].failure_streak == 0
+    assert health["fake"].latencies == []
+
+
+def test_completed_fetch_within_budget_keeps_health():
+    health = {"fake": SourceHealth("fake", latencies=[0.5])}
+    assert pipeline.fetch_one(SPEC, Config(), health, QuickSource(), Budget(5)) == []
+    assert health["fake"].latencies == [0.5, 0.25]
+
+
+def test_fetch_sources_returns_a_copy_of_skipped(monkeypatch):
+    budget = Budget(0)
+    monkeypatch.setattr(pipeline, "fetch_units", lambda configs: {})
+    _, skipped = pipeline.fetch_sources([Config()], {}, budget)
+    budget.skip("late")
+    assert skipped == []
+
+
+def test_profile_skipped_keeps_only_profile_sources():
+    skipped = [REGISTRY["uci"].display_name, REGISTRY["ucla"].display_name, REGISTRY["jhu"].display_name]
+    assert pipeline.profile_skipped(Config(sources=["ucla", "jhu"], disabled_sources=["jhu"]), skipped) == [
+        REGISTRY["ucla"].display_name,
+    ]
+    assert pipeline.profile_skipped(Config(), skipped) == skipped
+
+
+def test_deliver_marks_digest_partial_only_for_profile_sources(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sent = []
+    monkeypatch.setattr(email, "send_digest", lambda opps, config, skipped=None, reminders=None: sent.append(skipped))
+    opp = Opportunity(
+        id="ucla:1", title="Fellowship", url="", source=REGISTRY["ucla"].display_name, description="",
+        deadline=None, amount="", eligibility="", organization="",
+    )
+    assert pipeline.deliver(Config(sources=["ucla"]), [(opp, 50)], [REGISTRY["uci"].display_name])
+    assert sent == [[]]
@@ -0,0 +1,66 @@
+import pytest
+
+from fellowship_funding.sources.query import QueryCapabilities, plan_queries
+
+KEYWORDS = [
+    "nutrition", "Nutrition", "nutrition  science", "public health", "dietary behavior",
+    "food insecurity", "obesity", "epidemiology", "community health",
+]
+
+
+def _terms(queries: list[str], operator: str = " OR ") -> list[str]:
+    return [term.strip('"') for query in queries for term in query.split(operator)]
+
+
+def test_empty_keywords_run_one_unfiltered_search():
+    assert plan_queries([], QueryCapabilities()) == [""]
+    assert plan_queries(["  "], QueryCapabilities(supports_or=True)) == [""]
+
+
+def test_one_search_per_term_without_or():
+    assert plan_queries(["a", "b"], QueryCapabilities()) == ["a", "b"]
+
+
+def test_dedupes_case_and_whitespace():
+    assert plan_queries(["Nutrition", "nutrition", " nutrition "], QueryCapabilities(full_text=False)) == ["Nutrition"]
+
+
+def test_full_text_drops_subsumed_phrases():
+    queries = plan_queries(KEYWORDS, QueryCapabilities())
+    assert "nutrition science" not in queries
+    assert "nutrition" in queries
+
+
+def test_exact_match_sources_keep_phrases():
+    queries = plan_queries(["health", "public health"], QueryCapabilities(full_text=False))
+    assert queries == ["health", "public health"]
+
+
+def test_or_packing_covers_every_term_once():
+    caps = QueryCapabilities(supports_or=True)
+    queries = plan_queries(KEYWORDS, caps)
+    assert len(queries) == 1
+    assert sorted(_terms(queries)) == sorted(plan_queries(KEYWORDS, QueryCapabilities()))
+
+
+@pytest.mark.parametrize("limit", [20, 40, 64, 256])
+def test_or_packing_respects_length_limit(limit):
+    caps = QueryCapabilities(supports_or=True, max_query_length=limit)
+    queries = plan_queries(KEYWORDS, caps)
+    assert all(len(query) <= limit for query in queries)
+    assert sorted(_terms(queries)) == sorted(plan_queries(KEYWORDS, QueryCapabilities()))
+
+
+def test_first_fit_decreasing_packs_tightly():
+    caps = QueryCapabilities(supports_or=True, max_query_length=40)
+    assert len(plan_queries(KEYWORDS, caps)) == 3
+
+
+def test_overlong_term_is_sent_alone():
+    caps = QueryCapabilities(supports_or=True, max_query_length=10)
+    assert plan_queries(["a very long phrase", "b"], caps) == ['"a very long phrase"', "b"]
+
+
+def test_multiword_terms_are_quoted():
+    caps = QueryCapabilities(supports_or=True, or_operator=" | ")
+    assert plan_queries(["public health", "obesity"], caps) == ['"public health" | obesity']
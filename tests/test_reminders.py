@@ -0,0 +1,120 @@
+import base64
+import json
+from datetime import date, timedelta
+from email import message_from_bytes
+
+from fellowship_funding import corpus, email, pipeline, reminders
+from fellowship_funding.config import Config
+from fellowship_funding.dedup import save_seen, seen_path
+from fellowship_funding.reminders import ReminderIndex, load_reminders, save_reminders
+from fellowship_funding.sources.base import Opportunity
+
+TODAY = date(2026, 10, 19)
+
+
+def _opp(id: str, deadline: date | None) -> Opportunity:
+    return Opportunity(
+        id=id, title=id, url=f"https://example.org/{id}", source="UCLA Graduate Funding",
+        description="long text", deadline=deadline, amount="", eligibility="", organization="",
+    )
+
+
+def _due(index: ReminderIndex, today: date) -> list[tuple[str, int]]:
+    return [(opp.id, days) for opp, days in index.pop_due(today)]
+
+
+def test_pop_due_returns_only_reminders_that_came_due():
+    index = ReminderIndex()
+    index.schedule([_opp("soon", TODAY + timedelta(days=10)), _opp("later", TODAY + timedelta(days=40))], [7], TODAY)
+    assert _due(index, TODAY) == []
+    assert _due(index, TODAY + timedelta(days=3)) == [("soon", 7)]
+    assert len(index) == 1
+    assert _due(index, TODAY + timedelta(days=33)) == [("later", 7)]
+    assert len(index) == 0 and index.records == {}
+
+
+def test_each_window_re_arms_until_the_last():
+    index = ReminderIndex()
+    index.schedule([_opp("a", TODAY + timedelta(days=20))], [14, 3], TODAY)
+    assert _due(index, TODAY + timedelta(days=6)) == [("a", 14)]
+    # The record stays while a later window is queued
+    assert "a" in index.records
+    assert _due(index, TODAY + timedelta(days=17)) == [("a", 3)]
+    assert "a" not in index.records
+
+
+def test_missed_runs_send_one_reminder_per_opportunity():
+    index = ReminderIndex()
+    index.schedule([_opp("a", TODAY + timedelta(days=20))], [14, 3], TODAY)
+    assert _due(index, TODAY + timedelta(days=18)) == [("a", 2)]
+    assert len(index) == 0
+
+
+def test_expired_deadlines_are_dropped_without_a_reminder():
+    index = ReminderIndex()
+    index.schedule([_opp("a", TODAY + timedelta(days=10))], [7], TODAY)
+    assert _due(index, TODAY + timedelta(days=11)) == []
+    assert len(index) == 0 and index.records == {}
+
+
+def test_schedule_skips_open_windows_and_known_ids():
+    index = ReminderIndex()
+    opp = _opp("a", TODAY + timedelta(days=5))
+    assert index.schedule([opp, _opp("none", None)], [7, 3, 0], TODAY) == 1
+    assert index.schedule([opp], [7, 3], TODAY) == 0
+    assert index.records["a"]["description"] == ""
+
+
+def test_round_trip(tmp_path):
+    index = ReminderIndex()
+    index.schedule([_opp("a", TODAY + timedelta(days=20)), _opp("b", TODAY + timedelta(days=30))], [14, 7], TODAY)
+    path = tmp_path / "reminders.json"
+    save_reminders(index, path)
+    loaded = load_reminders(path)
+    assert sorted(loaded.heap) == sorted(index.heap)
+    assert _due(loaded, TODAY + timedelta(days=16)) == [("a", 4), ("b", 14)]
+    assert load_reminders(tmp_path / "missing.json") is None
+    path.write_text(json.dumps({"version": 0}))
+    assert load_reminders(path) is None
+
+
+def test_seeded_index_is_saved_when_nothing_is_sent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_seen({"a": "2026-10-01"}, seen_path())
+    corpus.upsert([_opp("a", date.today() + timedelta(days=40))])
+    loads = []
+    load_all = corpus.load_all
+    monkeypatch.setattr(corpus, "load_all", lambda: loads.append(1) or load_all())
+
+    assert pipeline.deliver(Config(), [])
+    assert pipeline.deliver(Config(), [])
+    assert len(loads) == 1
+    assert len(load_reminders(reminders.reminders_path())) == len(Config().reminder_days)
+
+
+def _sent_message(monkeypatch, opportunities, reminders_due):
+    sent = []
+    monkeypatch.setattr(email, "_get_access_token", lambda config: "token")
+    monkeypatch.setattr(email.requests, "post", lambda url, **kwargs: sent.append(kwargs["json"]) or _Ok())
+    config = Config(gmail_refresh_token="t", sender_email="me@example.org", recipient_email="you@example.org")
+    email.send_digest(opportunities, config, [], reminders_due)
+    message = message_from_bytes(base64.urlsafe_b64decode(sent[0]["raw"]))
+    return message["Subject"], message.get_payload()[0].get_payload(decode=True).decode()
+
+
+class _Ok:
+    def raise_for_status(self):
+        pass
+
+
+def test_reminder_only_digest_says_so(monkeypatch):
+    subject, html = _sent_message(monkeypatch, [], [(_opp("a", TODAY + timedelta(days=3)), 3)])
+    assert subject.startswith("Fellowship Digest: 1 deadline reminders (")
+    assert "0 new opportunities" not in html
+    assert "No new opportunities this week; 1 upcoming deadlines below." in html
+
+
+def test_digest_with_new_opportunities_keeps_counts(monkeypatch):
+    subject, html = _sent_message(monkeypatch, [(_opp("b", None), 20)], [(_opp("a", TODAY), 0)])
+    assert subject.startswith("Fellowship Digest: 1 new opportunities, 1 deadline reminders (")
+    assert "1 new opportunities found." in html
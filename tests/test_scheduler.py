@@ -0,0 +1,123 @@
+import os
+
+import pytest
+
+from fellowship_funding import email, scheduler
+from fellowship_funding.config import Config
+from fellowship_funding.pipeline import source_keys
+from fellowship_funding.scheduler import Scheduler, parse_cadence
+from fellowship_funding.sources import REGISTRY
+from fellowship_funding.sources.base import Opportunity, Source
+
+T0 = 1_800_000_000.0
+HOUR = 3600.0
+
+
+class FakeSource(Source):
+    def __init__(self, name: str):
+        self.name = name
+        self.fetches = 0
+
+    def fetch(self) -> list[Opportunity]:
+        self.fetches += 1
+        return [Opportunity(
+            id=f"{self.name}:{self.fetches}", title=f"Nutrition fellowship {self.fetches}", url="",
+            source=self.name, description="nutrition", deadline=None, amount="", eligibility="",
+            organization="",
+        )]
+
+
+@pytest.fixture
+def sent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scheduler.time, "time", lambda: T0)
+    digests = []
+    monkeypatch.setattr(email, "send_digest", lambda opps, config, *args: digests.append(sorted(o.id for o, _ in opps)))
+    return digests
+
+
+def _scheduler(names: list[str], **kwargs) -> tuple[Scheduler, dict[str, FakeSource]]:
+    config = Config(keywords=["nutrition"], sources=names)
+    sched = Scheduler([config], **kwargs)
+    fakes = {}
+    for name, key in zip(names, source_keys(config)):
+        fakes[name] = sched.sources[key] = FakeSource(REGISTRY[name].display_name)
+    return sched, fakes
+
+
+def _fetches(fakes: dict[str, FakeSource]) -> dict[str, int]:
+    return {name: fake.fetches for name, fake in fakes.items()}
+
+
+def test_sources_poll_on_their_cadence(sent):
+    sched, fakes = _scheduler(["zintellect", "ucsd"], cadence_hours={"ucsd": 48.0})
+    sched.tick(T0)
+    assert _fetches(fakes) == {"zintellect": 1, "ucsd": 1}
+    sched.tick(T0 + 23 * HOUR)
+    assert _fetches(fakes) == {"zintellect": 1, "ucsd": 1}
+    sched.tick(T0 + 24 * HOUR)
+    assert _fetches(fakes) == {"zintellect": 2, "ucsd": 1}
+    sched.tick(T0 + 48 * HOUR)
+    assert _fetches(fakes) == {"zintellect": 3, "ucsd": 2}
+    assert sent == []
+
+
+def test_digest_fires_on_interval_with_pending_records(sent):
+    sched, fakes = _scheduler(["zintellect"], digest_hours=48.0)
+    sched.tick(T0)
+    sched.tick(T0 + 24 * HOUR)
+    assert sent == []
+    sched.tick(T0 + 48 * HOUR)
+    assert sent == [["Zintellect/ORISE:1", "Zintellect/ORISE:2", "Zintellect/ORISE:3"]]
+    # Delivered records are seen and leave the queue
+    assert sched.pending[""] == {}
+    sched.tick(T0 + 49 * HOUR)
+    assert len(sent) == 1
+
+
+def test_missed_digests_fire_once(sent):
+    sched, _ = _scheduler(["ucsd"], digest_hours=24.0)
+    sched.tick(T0)
+    sched.tick(T0 + 100 * HOUR)
+    assert len(sent) == 1
+    assert sched.next_digest == T0 + 120 * HOUR
+
+
+def test_failed_digest_keeps_records_pending(sent, monkeypatch):
+    sched, _ = _scheduler(["ucsd"], digest_hours=24.0)
+    sched.tick(T0)
+    monkeypatch.setattr(scheduler, "deliver", lambda config, opps: False)
+    sched.tick(T0 + 24 * HOUR)
+    assert list(sched.pending[""]) == ["UCSD Young Investigator:1"]
+
+
+def test_watched_source_polls_when_file_changes(sent, tmp_path):
+    sched, fakes = _scheduler(["jhu"])
+    sched.tick(T0)
+    assert fakes["jhu"].fetches == 0
+    path = tmp_path / REGISTRY["jhu"].watch
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"v1")
+    sched.tick(T0 + 1)
+    sched.tick(T0 + 2)
+    assert fakes["jhu"].fetches == 1
+    os.utime(path, (T0, T0))
+    sched.tick(T0 + 3)
+    assert fakes["jhu"].fetches == 2
+
+
+def test_parse_cadence():
+    assert parse_cadence(["ucla=12", "jhu=0.5"]) == {"ucla": 12.0, "jhu": 0.5}
+    for item in ("ucla", "nope=1", "ucla=soon", "ucla=0", "ucla=inf"):
+        with pytest.raises(ValueError):
+            parse_cadence([item])
+
+
+def test_bad_cadence_is_a_usage_error(capsys):
+    from fellowship_funding.main import _parse_args
+
+    with pytest.raises(SystemExit) as exc:
+        _parse_args(["serve-scheduler", "--cadence", "zintellect"])
+    assert exc.value.code == 2
+    assert "Expected --cadence SOURCE=HOURS" in capsys.readouterr().err
+    assert _parse_args(["serve-scheduler", "--cadence", "ucla=6"]).cadence == {"ucla": 6.0}
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+import pytest
+
+from fellowship_funding.config import Config
+from fellowship_funding.scoring import prefilter, select_digest
+from fellowship_funding.sources import REGISTRY, SourceSpec
+from fellowship_funding.sources.base import Opportunity
+
+TODAY = date(2026, 10, 19)
+
+
+def _opp(id: str, source: str = "UCLA Graduate Funding", deadline: date | None = None, title: str = "") -> Opportunity:
+    return Opportunity(
+        id=id, title=title or id, url="", source=source, description="", deadline=deadline,
+        amount="", eligibility="", organization="",
+    )
+
+
+def _ids(selected: list[tuple[Opportunity, int]]) -> list[str]:
+    return [opp.id for opp, _ in selected]
+
+
+def test_unbounded_digest_sorts_by_score():
+    scored = [(_opp("a"), 10), (_opp("b"), 30), (_opp("c"), 20)]
+    assert _ids(select_digest(scored, Config(), TODAY)) == ["b", "c", "a"]
+
+
+def test_max_digest_keeps_top_k():
+    scored = [(_opp(str(i)), i) for i in range(20)]
+    assert _ids(select_digest(scored, Config(max_digest=3), TODAY)) == ["19", "18", "17"]
+
+
+def test_ties_keep_earlier_record():
+    scored = [(_opp("first"), 10), (_opp("second"), 10), (_opp("third"), 10)]
+    assert _ids(select_digest(scored, Config(max_digest=2), TODAY)) == ["first", "second"]
+
+
+def test_source_cap_limits_one_source():
+    scored = [(_opp(f"ucla{i}"), 50 + i) for i in range(5)]
+    scored += [(_opp(f"uci{i}", "UCI Graduate Fellowships"), 10 + i) for i in range(3)]
+    selected = select_digest(scored, Config(source_caps={"ucla": 2}), TODAY)
+    assert _ids(selected) == ["ucla4", "ucla3", "uci2", "uci1", "uci0"]
+
+
+def test_cap_and_limit_combine():
+    scored = [(_opp(f"ucla{i}"), 50 + i) for i in range(5)]
+    scored += [(_opp(f"uci{i}", "UCI Graduate Fellowships"), 10 + i) for i in range(3)]
+    selected = select_digest(scored, Config(max_digest=3, source_caps={"ucla": 1}), TODAY)
+    assert _ids(selected) == ["ucla4", "uci2", "uci1"]
+
+
+def test_zero_cap_drops_source():
+    scored = [(_opp("ucla"), 50), (_opp("uci", "UCI Graduate Fellowships"), 10)]
+    assert _ids(select_digest(scored, Config(source_caps={"ucla": 0}), TODAY)) == ["uci"]
+
+
+def test_min_deadline_days_drops_close_deadlines():
+    scored = [
+        (_opp("soon", deadline=TODAY + timedelta(days=3)), 50),
+        (_opp("later", deadline=TODAY + timedelta(days=30)), 40),
+        (_opp("open", deadline=None), 30),
+    ]
+    assert _ids(select_digest(scored, Config(min_deadline_days=7), TODAY)) == ["later", "open"]
+
+
+def test_source_caps_do_not_import_sources(monkeypatch):
+    def fail(self):
+        raise AssertionError(f"{self.name} was imported")
+
+    monkeypatch.setattr(SourceSpec, "load", fail)
+    select_digest([(_opp("a"), 10)], Config(source_caps={name: 1 for name in REGISTRY}), TODAY)
+
+
+@pytest.mark.parametrize("name", list(REGISTRY))
+def test_display_names_match_source_classes(name):
+    spec = REGISTRY[name]
+    assert spec.load().name == spec.display_name
+
+
+def test_prefilter_drops_expired_and_no_signal():
+    config = Config(keywords=["nutrition"], disciplines=[], academic_level="postdoc")
+    opps = [
+        _opp("expired", deadline=TODAY - timedelta(days=1), title="nutrition award"),
+        _opp("grace", deadline=TODAY, title="nutrition award"),
+        _opp("off-topic", title="physics award"),
+        _opp("match", title="Nutrition Fellowship"),
+    ]
+    assert [opp.id for opp in prefilter(opps, config, TODAY)] == ["grace", "match"]
+
+
+def test_prefilter_reports_drops_per_source(caplog):
+    config = Config(keywords=["nutrition"], disciplines=[], academic_level="postdoc")
+    opps = [_opp("off-topic", title="physics award"), _opp("expired", deadline=TODAY - timedelta(days=1))]
+    with caplog.at_level("INFO", logger="fellowship_funding.scoring"):
+        prefilter(opps, config, TODAY)
+        assert [r.getMessage() for r in caplog.records] == [
+            "[default] Pre-filter UCLA Graduate Funding: dropped 1 expired, 1 without term hits",
+        ]
+        caplog.clear()
+        prefilter(opps, config, TODAY, report=False)
+        assert caplog.records == []
@@ -0,0 +1,100 @@
+import http.client
+import json
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from fellowship_funding import corpus
+from fellowship_funding.config import Config
+from fellowship_funding.scoring import prefilter
+from fellowship_funding.server import ApiServer, IndexHolder, OpportunityIndex
+from fellowship_funding.sources.base import Opportunity
+
+FUTURE = date.today() + timedelta(days=60)
+
+OPPORTUNITIES = [
+    Opportunity(
+        id=f"test:{i}", title=title, url=f"https://example.org/{i}", source="Test", description=description,
+        deadline=deadline, amount="", eligibility="", organization="",
+    )
+    for i, (title, description, deadline) in enumerate([
+        ("Nutrition Dissertation Fellowship", "Food insecurity research", FUTURE),
+        ("Epidemiological Methods Award", "For nonpublic healthy-aging studies", FUTURE),
+        ("Physics Prize", "Condensed matter", FUTURE),
+        ("Expired Nutrition Grant", "nutrition", date.today() - timedelta(days=30)),
+        ("Write-up Support", "Thesis write-up funding", None),
+        ("Community Health Fellowship", "public health practice", None),
+    ])
+]
+
+
+@pytest.mark.parametrize("keywords", [
+    ["nutrition"], ["public health"], ["epidemiolog"], ["write-up"], ["c health"], ["physics", "matter"], [],
+])
+def test_candidates_cover_prefilter(keywords):
+    config = Config(keywords=keywords, disciplines=[], academic_level="postdoc")
+    index = OpportunityIndex(OPPORTUNITIES)
+    expected = prefilter(OPPORTUNITIES, config)
+    assert {opp.id for opp in prefilter(index.candidates(config), config)} == {opp.id for opp in expected}
+
+
+def test_candidates_skip_records_without_term_tokens():
+    config = Config(keywords=["nutrition"], disciplines=[], academic_level="postdoc")
+    ids = {opp.id for opp in OpportunityIndex(OPPORTUNITIES).candidates(config)}
+    assert ids == {"test:0", "test:3"}
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    path = tmp_path_factory.mktemp("server") / "corpus.db"
+    corpus.upsert(OPPORTUNITIES, path)
+    server = ApiServer(("127.0.0.1", 0), IndexHolder(path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server: ApiServer, body: bytes, path: str = "/score") -> tuple[int, dict]:
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def test_score_returns_ranked_matches(server):
+    status, page = _post(server, json.dumps({
+        "keywords": ["nutrition"], "disciplines": [], "academic_level": "postdoc", "score_threshold": 1,
+    }).encode())
+    assert status == 200
+    assert [item["id"] for item in page["items"]] == ["test:0"]
+    assert page["items"][0]["score"] > 0
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[1, 2]",
+    json.dumps({"keywords": [1]}).encode(),
+    json.dumps({"keywords": "nutrition"}).encode(),
+    json.dumps({"disciplines": None}).encode(),
+    json.dumps({"academic_level": 3}).encode(),
+    json.dumps({"score_threshold": "high"}).encode(),
+    json.dumps({"score_threshold": [1]}).encode(),
+    json.dumps({"source_caps": ["ucla"]}).encode(),
+    json.dumps({"sources": ["nope"]}).encode(),
+])
+def test_score_rejects_bad_profiles(server, body):
+    status, payload = _post(server, body)
+    assert status == 400
+    assert payload["error"]
+
+
+def test_score_rejects_bad_paging(server):
+    status, payload = _post(server, json.dumps({"keywords": ["nutrition"]}).encode(), "/score?limit=many")
+    assert status == 400
+    assert payload["error"]
@@ -0,0 +1,118 @@
+import os
+from datetime import date
+
+import pytest
+
+from fellowship_funding import checkpoints, main, shards
+from fellowship_funding.config import Config
+from fellowship_funding.pipeline import fetch_units, shard_keys
+from fellowship_funding.sources.base import Opportunity
+from fellowship_funding.sources.health import SourceHealth
+
+CONFIGS = [Config(name="a", sources=["ucla", "uci", "ca_grants", "pathways"])]
+KEY = checkpoints.fingerprint(CONFIGS)
+
+
+def _opp(id: str) -> Opportunity:
+    return Opportunity(
+        id=id, title=id, url="", source="UCLA Graduate Funding", description="nutrition",
+        deadline=date(2026, 12, 1), amount="", eligibility="", organization="",
+    )
+
+
+def _result(index: int, count: int = 2, run_id: str = "20261019", fingerprint: str = KEY) -> shards.ShardResult:
+    return shards.ShardResult(
+        index, count, fetched={("ucla", f"{{\"shard\": {index}}}"): [_opp(f"ucla:{index}")]},
+        scores={"a": {f"ucla:{index}": 12}}, run_id=run_id, fingerprint=fingerprint,
+    )
+
+
+def test_round_trip(tmp_path):
+    result = _result(1)
+    result.skipped = ["UCI Graduate Fellowships"]
+    result.health = {"ucla": SourceHealth("ucla", failure_streak=2)}
+    path = shards.shard_path(1, 2, tmp_path)
+    shards.write_shard(result, path)
+    loaded = shards.read_shard(path)
+    assert (loaded.index, loaded.count, loaded.run_id, loaded.fingerprint) == (1, 2, "20261019", KEY)
+    assert loaded.fetched == result.fetched
+    assert loaded.skipped == result.skipped and loaded.scores == result.scores
+    assert loaded.health["ucla"].failure_streak == 2
+
+
+def test_read_rejects_old_format(tmp_path):
+    path = shards.shard_path(0, 1, tmp_path)
+    shards.write_shard(_result(0, 1), path)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(shards, "FORMAT_VERSION", 3)
+        with pytest.raises(ValueError):
+            shards.read_shard(path)
+
+
+def _written(tmp_path, *results: shards.ShardResult) -> list:
+    # Written oldest first
+    paths = []
+    for age, result in enumerate(results):
+        path = tmp_path / f"shard-{len(list(tmp_path.iterdir()))}.json.gz"
+        shards.write_shard(result, path)
+        os.utime(path, (1_000_000 + age, 1_000_000 + age))
+        paths.append(path)
+    return paths
+
+
+def test_current_run_ignores_stale_artifacts(tmp_path):
+    paths = _written(
+        tmp_path,
+        _result(1, run_id="20261012"),
+        _result(1, count=3),
+        _result(1, fingerprint="other"),
+        _result(0),
+        _result(0),
+    )
+    kept = shards.current_run([(path, shards.read_shard(path)) for path in paths], KEY)
+    assert [path for path, _ in kept] == [paths[3]]
+
+
+def test_current_run_prefers_latest_run(tmp_path):
+    paths = _written(tmp_path, _result(0, run_id="20261012"), _result(0, run_id="20261019"))
+    kept = shards.current_run([(path, shards.read_shard(path)) for path in paths], KEY)
+    assert [result.run_id for _, result in kept] == ["20261019"]
+
+
+@pytest.fixture
+def merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "load_profiles", lambda: CONFIGS)
+    calls = []
+    monkeypatch.setattr(main, "report", lambda *args: calls.append(args))
+    return calls
+
+
+def test_merge_marks_missing_shard_partial_and_removes_artifacts(tmp_path, merged):
+    (stale,) = _written(tmp_path, _result(1, run_id="20261012"))
+    (path,) = _written(tmp_path, _result(0))
+    main.merge([path, stale])
+
+    (_, fetched, skipped, _, _, scores, *_) = merged[0]
+    units = fetch_units(CONFIGS)
+    missing = {units[key][0].display_name for key in shard_keys(units, 1, 2)}
+    assert missing and set(skipped) == missing
+    assert [opp.id for opps in fetched.values() for opp in opps] == ["ucla:0"]
+    assert scores == {"a": {"ucla:0": 12}}
+    assert not path.exists()
+    # Ignored artifacts are left alone
+    assert stale.exists()
+
+
+def test_merge_complete_run_is_not_partial(tmp_path, merged):
+    paths = _written(tmp_path, _result(0), _result(1))
+    main.merge(paths)
+    assert merged[0][2] == []
+
+
+def test_merge_without_current_artifacts_exits(tmp_path, merged):
+    paths = _written(tmp_path, _result(0, fingerprint="other"))
+    (tmp_path / "broken.json.gz").write_text("not gzip")
+    with pytest.raises(SystemExit):
+        main.merge([*paths, tmp_path / "broken.json.gz"])
+    assert not merged and paths[0].exists()
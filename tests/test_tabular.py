@@ -0,0 +1,37 @@
+import json
+from datetime import date
+
+from fellowship_funding.config import Config
+from fellowship_funding.scoring import select_digest
+from fellowship_funding.sources import REGISTRY
+from fellowship_funding.sources.tabular import TabularSource
+
+
+def _write_lists(directory):
+    directory.mkdir(parents=True)
+    (directory / "dept_awards.csv").write_text(
+        "Title,Deadline,Organization\n"
+        "Travel grant,12/01/2026,\n"
+        "Writing fellowship,2026-12-15,Graduate Division\n"
+    )
+    (directory / "foundations.csv").write_text("Name,Due Date\nSeed award,01/15/2027\n")
+    (directory / "mappings.json").write_text(json.dumps({"foundations.csv": {"source": "Foundation List"}}))
+
+
+def test_records_carry_registry_display_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_lists(tmp_path / "data/tabular")
+    opps = {opp.title: opp for opp in TabularSource().fetch()}
+    assert {opp.source for opp in opps.values()} == {REGISTRY["tabular"].display_name}
+    assert opps["Travel grant"].organization == "dept awards"
+    assert opps["Writing fellowship"].organization == "Graduate Division"
+    assert opps["Seed award"].organization == "Foundation List"
+    assert opps["Seed award"].deadline == date(2027, 1, 15)
+
+
+def test_tabular_cap_is_enforced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_lists(tmp_path / "data/tabular")
+    scored = [(opp, score) for score, opp in enumerate(TabularSource().fetch())]
+    selected = select_digest(scored, Config(source_caps={"tabular": 1}), date(2026, 10, 19))
+    assert [opp.title for opp, _ in selected] == [scored[-1][0].title]
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from fellowship_funding.sources import zintellect
+from fellowship_funding.sources.zintellect import MAX_PAGES, PAGE_SIZE, ZintellectSource
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self.body = json.dumps(payload).encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 4096):
+            yield self.body[i:i + 4096]
+
+
+def _item(i: int) -> dict:
+    return {"id": i, "title": f"Opportunity {i}", "referenceCode": f"REF-{i}", "expirationDate": "12-31-2026"}
+
+
+def _serve(monkeypatch, page_for):
+    starts = []
+
+    def request(self, method, url, data=None, **kwargs):
+        starts.append(data["start"])
+        return FakeResponse(page_for(data["start"]))
+
+    monkeypatch.setattr(ZintellectSource, "_request", request)
+    return starts
+
+
+def _full_page(start: int) -> list[dict]:
+    return [_item(start + i) for i in range(PAGE_SIZE)]
+
+
+def test_pages_until_short_page(monkeypatch):
+    starts = _serve(monkeypatch, lambda start: {
+        "data": _full_page(start) if start < 2 * PAGE_SIZE else [_item(start)],
+    })
+    assert len(ZintellectSource(["nutrition"]).fetch()) == 2 * PAGE_SIZE + 1
+    assert starts == [0, PAGE_SIZE, 2 * PAGE_SIZE]
+
+
+def test_stops_when_endpoint_ignores_start(monkeypatch):
+    starts = _serve(monkeypatch, lambda start: {"data": _full_page(0)})
+    assert len(ZintellectSource(["nutrition"]).fetch()) == PAGE_SIZE
+    assert starts == [0, PAGE_SIZE]
+
+
+@pytest.mark.parametrize("before", [True, False])
+def test_stops_at_reported_total(monkeypatch, before):
+    def page(start):
+        if before:
+            return {"draw": 1, "recordsTotal": 450, "data": _full_page(start)}
+        return {"data": _full_page(start), "recordsTotal": 450, "recordsFiltered": 450}
+
+    starts = _serve(monkeypatch, page)
+    ZintellectSource(["nutrition"]).fetch()
+    assert starts == [0, PAGE_SIZE, 2 * PAGE_SIZE]
+
+
+def test_caps_pages_without_total(monkeypatch):
+    starts = _serve(monkeypatch, lambda start: {"data": _full_page(start)})
+    assert len(ZintellectSource(["nutrition"]).fetch()) == MAX_PAGES * PAGE_SIZE
+    assert len(starts) == MAX_PAGES
+
+
+def test_later_queries_page_past_known_ids(monkeypatch):
+    monkeypatch.setattr(zintellect.ZintellectSource, "query_capabilities", zintellect.QueryCapabilities())
+    starts = _serve(monkeypatch, lambda start: {
+        "data": _full_page(start) if start < PAGE_SIZE else [_item(start)],
+    })
+    assert len(ZintellectSource(["nutrition", "obesity"]).fetch()) == PAGE_SIZE + 1
+    assert starts == [0, PAGE_SIZE, 0, PAGE_SIZE]